@@ -0,0 +1,103 @@
+"""
+Change tracking for user data.
+
+Mutating route handlers call ``mark_changed`` on their session before they
+commit. The user's data versions (behind the list endpoints' ETags) are bumped
+inside that same transaction; every other follow-up of "this user's data
+changed" runs once it has actually committed, from this one place, so the
+handlers don't have to repeat it. A rollback discards the pending changes.
+
+Deletions are also recorded as tombstones with ``record_deletions`` so that
+delta sync can report them.
+"""
+
+# Standard library imports
+from datetime import timedelta
+from typing import Iterable
+
+# Third-party imports
+from sqlalchemy import delete, event, insert
+from sqlalchemy.orm import Session
+
+# Local imports
+from app.core.config import SYNC_TOMBSTONE_RETENTION_DAYS
+from app.core.events import event_broker
+from app.core.response_cache import response_cache
+from app.db.counters import increment
+from app.db.database import record_write
+from app.models import Tombstone, UserDataVersion, utcnow
+
+_CHANGES_KEY = "changed_users"
+
+
+def mark_changed(session: Session, username: str, entity: str) -> None:
+    """
+    Record that the session's transaction modifies ``username``'s data.
+
+    Args:
+        session: The session that will commit the change
+        username: The owner of the modified data
+        entity: What was modified ("todo" or "category")
+    """
+    session.info.setdefault(_CHANGES_KEY, {}).setdefault(username, set()).add(entity)
+
+
+def record_deletions(
+    session: Session, username: str, entity: str, ids: Iterable[str]
+) -> None:
+    """
+    Write tombstones for deleted rows in the session's transaction.
+
+    The user's tombstones older than the retention period are pruned at the
+    same time, so the table stays proportional to recent deletions.
+
+    Args:
+        session: The session that deleted the rows
+        username: The owner of the deleted rows
+        entity: What was deleted ("todo" or "category")
+        ids: The ids of the deleted rows
+    """
+    now = utcnow()
+    rows = [
+        {"username": username, "entity": entity, "entity_id": row_id, "deleted_at": now}
+        for row_id in ids
+    ]
+    if not rows:
+        return
+    session.execute(
+        delete(Tombstone).where(
+            Tombstone.username == username,
+            Tombstone.deleted_at < now - timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS),
+        )
+    )
+    session.execute(insert(Tombstone), rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session: Session) -> None:
+    increment(
+        session,
+        UserDataVersion,
+        ("username", "entity"),
+        [
+            {"username": username, "entity": entity, "version": 1}
+            for username, entities in sorted(session.info.get(_CHANGES_KEY, {}).items())
+            for entity in sorted(entities)
+        ],
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session: Session) -> None:
+    changes = session.info.pop(_CHANGES_KEY, None)
+    if not changes:
+        return
+    for username, entities in changes.items():
+        record_write(username)
+        response_cache.invalidate(username, entities)
+        event_broker.publish(username, {"type": "change", "entities": sorted(entities)})
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(session: Session, _previous_transaction) -> None:
+    session.info.pop(_CHANGES_KEY, None)
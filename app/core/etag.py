@@ -0,0 +1,89 @@
+"""
+Conditional GET support for the list endpoints.
+
+Every committed write bumps a per-user version counter for the kind of data
+it changed (see ``app.core.changes``). A list endpoint's weak ETag is built
+from the versions of the data it returns, so a client that sends it back in
+``If-None-Match`` gets ``304 Not Modified`` after a single primary-key
+lookup, without the listing being queried or serialized.
+"""
+
+# Standard library imports
+from typing import Iterable, Optional
+
+# Third-party imports
+from fastapi import Request, Response
+from sqlmodel import Session, select
+
+# Local imports
+from app.models import UserDataVersion
+
+ETAG_HEADER = "ETag"
+
+
+def current_etag(session: Session, username: str, entities: Iterable[str]) -> str:
+    """
+    Return the weak ETag of ``username``'s data of the given kinds.
+
+    Read it with the same session as the listing itself, so both come from
+    the same database (and, inside one transaction, the same snapshot).
+
+    Args:
+        session: The session the listing is read with
+        username: The owner of the data
+        entities: The kinds of data the listing contains, e.g. ("todo",)
+
+    Returns:
+        str: A weak ETag such as ``W/"3.7"``
+    """
+    entities = tuple(entities)
+    # pylint: disable=no-member
+    versions = dict(
+        session.exec(
+            select(UserDataVersion.entity, UserDataVersion.version).where(
+                UserDataVersion.username == username,
+                UserDataVersion.entity.in_(entities),
+            )
+        ).all()
+    )
+    # pylint: enable=no-member
+    return 'W/"' + ".".join(str(versions.get(entity, 0)) for entity in entities) + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches ``etag`` (weakly)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in header.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    """Build the 304 response for a matching conditional request."""
+    return Response(status_code=304, headers={ETAG_HEADER: etag})
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    session: Session,
+    username: str,
+    entities: Iterable[str],
+) -> Optional[Response]:
+    """
+    Handle If-None-Match for a list endpoint.
+
+    Sets the ETag on ``response`` and returns the 304 response to send
+    instead when the client's copy is current, otherwise None.
+    """
+    etag = current_etag(session, username, entities)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers[ETAG_HEADER] = etag
+    return None
@@ -0,0 +1,194 @@
+"""
+Change notifications for connected clients.
+
+Committed writes publish a compact event for the user whose data changed
+(see ``app.core.changes``); the ``/events`` endpoint streams them to that
+user's open connections. Two broker backends are available:
+
+- ``LocalBroker`` fans events out inside one process. It is the default and
+  is enough with a single worker.
+- ``PollingBroker`` shares events between workers without extra
+  infrastructure: each worker polls the ``userdataversion`` counters of its
+  subscribed users and notifies them when a version moves, whichever worker
+  made the write. A Redis (or similar) pub/sub broker can be plugged in by
+  implementing the same ``subscribe``/``unsubscribe``/``publish`` methods.
+
+Every subscription has a bounded queue. When a slow consumer lets it fill
+up, the queued events are replaced by a single ``resync`` event telling the
+client to reload, so memory stays bounded and no change goes unnoticed.
+"""
+
+# Standard library imports
+import asyncio
+import threading
+from typing import Dict, Optional, Set
+
+# Third-party imports
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+
+# Local imports
+from app.core.config import (
+    EVENTS_BACKEND,
+    EVENTS_POLL_INTERVAL_SECONDS,
+    EVENTS_QUEUE_SIZE,
+)
+from app.core.metrics import Counter, Gauge
+from app.db.database import engine
+from app.models import UserDataVersion
+
+RESYNC_EVENT = {"type": "resync"}
+
+
+class Subscription:
+    """One client's queue of pending events."""
+
+    def __init__(self, username: str, max_queue: int):
+        self.username = username
+        self.queue: "asyncio.Queue[dict]" = asyncio.Queue(maxsize=max_queue)
+        self._loop = asyncio.get_running_loop()
+        self._resync_pending = False
+
+    def deliver(self, event: dict) -> None:
+        """Queue an event; safe to call from any thread."""
+        try:
+            self._loop.call_soon_threadsafe(self._put, event)
+        except RuntimeError:
+            # The loop has shut down; the connection is gone.
+            pass
+
+    def _put(self, event: dict) -> None:
+        if self._resync_pending:
+            # The client will reload everything anyway.
+            return
+        if not self.queue.full():
+            self.queue.put_nowait(event)
+            return
+        # The client is not keeping up: collapse everything into one resync.
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(RESYNC_EVENT)
+        self._resync_pending = True
+        events_dropped_total.inc()
+
+    async def get(self) -> dict:
+        """Wait for the next event."""
+        event = await self.queue.get()
+        if event is RESYNC_EVENT:
+            self._resync_pending = False
+        return event
+
+
+class LocalBroker:
+    """In-process publish/subscribe keyed by username."""
+
+    def __init__(self, max_queue: int):
+        self.max_queue = max_queue
+        self._subscriptions: Dict[str, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        """Open subscriptions across all users."""
+        return sum(len(subs) for subs in self._subscriptions.values())
+
+    def subscribe(self, username: str) -> Subscription:
+        """Open a subscription; must be called on the event loop."""
+        subscription = Subscription(username, self.max_queue)
+        with self._lock:
+            self._subscriptions.setdefault(username, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Close a subscription."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.username, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.username, None)
+
+    def publish(self, username: str, event: dict) -> None:
+        """Send an event to every subscription of ``username``."""
+        self._deliver(username, event)
+
+    def _deliver(self, username: str, event: dict) -> None:
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(username, ()))
+        for subscription in subscriptions:
+            subscription.deliver(event)
+        if subscriptions:
+            events_published_total.inc()
+
+
+class PollingBroker(LocalBroker):
+    """Broker that learns about every worker's writes from the database."""
+
+    def __init__(self, max_queue: int, interval: float):
+        super().__init__(max_queue)
+        self.interval = interval
+        self._versions: Dict[str, Dict[str, int]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, username: str) -> Subscription:
+        subscription = super().subscribe(username)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._poll())
+        return subscription
+
+    def publish(self, username: str, event: dict) -> None:
+        # Local writes are picked up by the poller like everyone else's.
+        pass
+
+    def _read_versions(self, usernames: list) -> Dict[str, Dict[str, int]]:
+        versions: Dict[str, Dict[str, int]] = {name: {} for name in usernames}
+        with Session(engine) as session:
+            # pylint: disable=no-member
+            rows = session.exec(
+                select(UserDataVersion).where(UserDataVersion.username.in_(usernames))
+            ).all()
+            # pylint: enable=no-member
+        for row in rows:
+            versions[row.username][row.entity] = row.version
+        return versions
+
+    async def _poll(self) -> None:
+        while True:
+            usernames = list(self._subscriptions)
+            if not usernames:
+                self._versions.clear()
+                return
+            current = await run_in_threadpool(self._read_versions, usernames)
+            previous_versions, self._versions = self._versions, current
+            for username, versions in current.items():
+                previous = previous_versions.get(username)
+                if previous is None:
+                    continue
+                changed = sorted(
+                    entity
+                    for entity, version in versions.items()
+                    if previous.get(entity) != version
+                )
+                if changed:
+                    self._deliver(username, {"type": "change", "entities": changed})
+            await asyncio.sleep(self.interval)
+
+
+def _create_broker() -> LocalBroker:
+    if EVENTS_BACKEND == "poll":
+        return PollingBroker(EVENTS_QUEUE_SIZE, EVENTS_POLL_INTERVAL_SECONDS)
+    return LocalBroker(EVENTS_QUEUE_SIZE)
+
+
+event_broker = _create_broker()
+
+events_published_total = Counter(
+    "events_published_total", "Change events delivered to at least one subscriber"
+)
+events_dropped_total = Counter(
+    "events_dropped_total", "Times a slow subscriber's queue overflowed into a resync"
+)
+Gauge(
+    "events_subscribers",
+    "Open /events subscriptions",
+    function=lambda: event_broker.subscriber_count,
+)
@@ -0,0 +1,135 @@
+"""
+Password hashing worker pool.
+
+bcrypt is deliberately slow (~250 ms per call at cost 12), so hashing and
+verification run on a dedicated, bounded thread pool instead of the event loop
+or the shared database thread pool. bcrypt releases the GIL while it works,
+so threads give real parallelism here.
+
+When every worker is busy and the wait queue is full, new work is rejected
+with ``503 Service Unavailable`` and a ``Retry-After`` header, so a login storm
+degrades into fast retries instead of starving the rest of the API.
+"""
+
+# Standard library imports
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, TypeVar
+
+# Third-party imports
+from fastapi import HTTPException, status
+
+# Local imports
+from app.core.config import (
+    HASHING_POOL_SIZE,
+    HASHING_QUEUE_LIMIT,
+    HASHING_RETRY_AFTER_SECONDS,
+)
+from app.core.metrics import Counter, Gauge, Histogram
+
+T = TypeVar("T")
+
+
+class HashingPool:
+    """A bounded thread pool with a fixed-size wait queue."""
+
+    def __init__(self, workers: int, queue_limit: int, retry_after: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.retry_after = retry_after
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @property
+    def pending(self) -> int:
+        """Jobs currently running or waiting for a worker."""
+        return self._pending
+
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self._pending - self.workers)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="hashing"
+            )
+        return self._executor
+
+    @staticmethod
+    def _timed(func: Callable[..., T], *args) -> T:
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            hashing_seconds.observe(
+                time.perf_counter() - started, operation=func.__name__
+            )
+
+    def _release(self, _: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run ``func(*args)`` on the pool and await its result.
+
+        Raises:
+            HTTPException: 503 with ``Retry-After`` if the queue is full
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.queue_limit:
+                hashing_rejected_total.inc()
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Server is busy, please retry later",
+                    headers={"Retry-After": str(self.retry_after)},
+                )
+            self._pending += 1
+
+        try:
+            future = self._get_executor().submit(self._timed, func, *args)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stop the worker threads, waiting for queued jobs to finish."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+hashing_pool = HashingPool(
+    workers=HASHING_POOL_SIZE,
+    queue_limit=HASHING_QUEUE_LIMIT,
+    retry_after=HASHING_RETRY_AFTER_SECONDS,
+)
+
+hashing_seconds = Histogram(
+    "password_hashing_seconds",
+    "Time spent in bcrypt, by operation",
+    ("operation",),
+    buckets=(0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1, 2, 5),
+)
+hashing_rejected_total = Counter(
+    "hashing_pool_rejected_total",
+    "Password hashing jobs rejected because the queue was full",
+)
+Gauge(
+    "hashing_pool_queue_depth",
+    "Password hashing jobs waiting for a worker",
+    function=lambda: hashing_pool.queue_depth,
+)
+Gauge(
+    "hashing_pool_in_flight",
+    "Password hashing jobs running or queued",
+    function=lambda: hashing_pool.pending,
+)
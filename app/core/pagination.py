@@ -0,0 +1,93 @@
+"""
+Keyset (cursor) pagination helpers.
+
+List endpoints are ordered by ``(created_at, id)``, which is stable and unique
+per row. A page is fetched with ``WHERE (created_at, id) > cursor ORDER BY
+created_at, id LIMIT n`` so every page costs the same regardless of how deep
+the client has paged, unlike ``OFFSET``. The cursor handed to clients is an
+opaque URL-safe token and is returned in the ``X-Next-Cursor`` header while
+more rows remain.
+"""
+
+# Standard library imports
+import base64
+import binascii
+import json
+from datetime import date
+from typing import List, Optional, Tuple
+
+# Third-party imports
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+from sqlmodel import Session
+
+# Local imports
+from app.core.config import MAX_PAGE_SIZE
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: date, row_id: str) -> str:
+    """Encode a sort key as an opaque cursor."""
+    raw = json.dumps([created_at.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, str]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return date.fromisoformat(created_at), str(row_id)
+    except (binascii.Error, ValueError, TypeError) as exc:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from exc
+
+
+def paginate(
+    session: Session,
+    statement,
+    model,
+    response: Response,
+    cursor: Optional[str],
+    limit: int,
+) -> List:
+    """
+    Fetch one page of ``statement`` ordered by ``(created_at, id)``.
+
+    Args:
+        session: The database session
+        statement: A select over ``model`` with the caller's filters applied
+        model: The table model, which must have ``created_at`` and ``id``
+        response: The response to attach the next-page cursor header to
+        cursor: The cursor of the previous page, if any
+        limit: The requested page size, capped at ``MAX_PAGE_SIZE``
+
+    Returns:
+        List: The rows of the requested page
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        statement = statement.where(
+            or_(
+                model.created_at > created_at,
+                and_(model.created_at == created_at, model.id > row_id),
+            )
+        )
+
+    rows = session.exec(
+        statement.order_by(model.created_at, model.id).limit(limit + 1)
+    ).all()
+
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.created_at, last.id)
+
+    return rows
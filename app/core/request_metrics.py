@@ -0,0 +1,191 @@
+"""
+Per-request metrics.
+
+``MetricsMiddleware`` is a pure ASGI middleware that times every HTTP request
+and records it per route template (``/todos/{todo_id}``, not the raw path, so
+label cardinality stays bounded). While a request runs, a ``RequestStats``
+object is bound to a context variable; SQLAlchemy cursor events add each
+statement's count and duration to it. Route handlers run in a worker thread
+with a copy of the request's context, which still refers to the same
+``RequestStats`` object, so their queries are attributed to the request.
+
+The cursor events are registered on the ``Engine`` class, so the primary,
+the read replica and any other engine are all measured.
+
+With ``SQL_TRACE`` enabled (see ``app.core.sql_trace``) every response also
+carries its query count and database time in debug headers.
+"""
+
+# Standard library imports
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+# Third-party imports
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Local imports
+from app.core.config import SQL_TRACE
+from app.core.metrics import Counter, Gauge, Histogram
+from app.db.database import engine, read_engine
+
+sql_logger = logging.getLogger("app.sql")
+
+UNMATCHED_ROUTE = "<unmatched>"
+QUERY_COUNT_HEADER = "X-DB-Query-Count"
+DB_TIME_HEADER = "X-DB-Time-Ms"
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", UNMATCHED_ROUTE)
+
+
+@dataclass
+class RequestStats:
+    """Database work done on behalf of one request."""
+
+    scope: Scope
+    queries: int = 0
+    db_seconds: float = 0.0
+
+    @property
+    def route(self) -> str:
+        """The matched route template (known once routing has run)."""
+        return _route_template(self.scope)
+
+    @property
+    def endpoint(self) -> str:
+        """The request method and route template, e.g. ``GET /todos``."""
+        return f"{self.scope['method']} {self.route}"
+
+
+def query_seconds(context) -> float:
+    """Return how long the statement of a cursor event context has run."""
+    return time.perf_counter() - context._query_started
+
+
+current_request: ContextVar[Optional[RequestStats]] = ContextVar(
+    "current_request", default=None
+)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(_conn, _cursor, _statement, _params, context, _many):
+    context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(_conn, _cursor, _statement, _params, context, _many):
+    elapsed = query_seconds(context)
+    db_queries_total.inc()
+    db_query_seconds_total.inc(elapsed)
+    stats = current_request.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    """Record count, latency and database work of every HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = current_request.set(stats)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SQL_TRACE:
+                    message.setdefault("headers", [])
+                    message["headers"] = list(message["headers"]) + [
+                        (
+                            QUERY_COUNT_HEADER.lower().encode(),
+                            str(stats.queries).encode(),
+                        ),
+                        (
+                            DB_TIME_HEADER.lower().encode(),
+                            f"{stats.db_seconds * 1000:.2f}".encode(),
+                        ),
+                    ]
+            await send(message)
+
+        http_requests_in_progress.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_progress.dec()
+            current_request.reset(token)
+            route = stats.route
+            method = scope["method"]
+            http_requests_total.inc(method=method, route=route, status=str(status_code))
+            http_request_duration_seconds.observe(
+                time.perf_counter() - started, method=method, route=route
+            )
+            db_queries_per_request.observe(stats.queries, route=route)
+            db_seconds_per_request.observe(stats.db_seconds, route=route)
+            if SQL_TRACE:
+                sql_logger.debug(
+                    "%s: %d queries, %.2f ms in the database",
+                    stats.endpoint,
+                    stats.queries,
+                    stats.db_seconds * 1000,
+                )
+
+
+def _checked_out(db_engine) -> float:
+    checkedout = getattr(db_engine.pool, "checkedout", None)
+    return float(checkedout()) if checkedout else 0.0
+
+
+http_requests_total = Counter(
+    "http_requests_total",
+    "HTTP requests by method, route template and status code",
+    ("method", "route", "status"),
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method and route template",
+    ("method", "route"),
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served"
+)
+db_queries_per_request = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per HTTP request",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+db_seconds_per_request = Histogram(
+    "db_seconds_per_request",
+    "Time spent executing SQL per HTTP request",
+    ("route",),
+)
+db_queries_total = Counter("db_queries_total", "SQL statements executed")
+db_query_seconds_total = Counter(
+    "db_query_seconds_total", "Time spent executing SQL statements"
+)
+Gauge(
+    "db_sessions_active",
+    "Database connections checked out of the primary pool",
+    function=lambda: _checked_out(engine),
+)
+Gauge(
+    "db_replica_sessions_active",
+    "Database connections checked out of the read replica pool",
+    function=lambda: _checked_out(read_engine) if read_engine is not engine else 0,
+)
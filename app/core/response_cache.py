@@ -0,0 +1,221 @@
+"""
+Per-user response cache for listing endpoints.
+
+Listing responses are stored as serialized JSON bytes under a key built from
+the user, the endpoint path, the query string and a per-user generation
+number for every kind of data the endpoint depends on ("todo", "category").
+A write bumps the generation of what it changed, so later lookups use new
+keys and the stale entries simply age out. A read that raced with a write
+stores its result under the old generation, where it is never served.
+
+The backend interface is the subset of the Redis client API the cache needs
+(``get``, ``set`` with ``ex``, ``incr``), so a ``redis.Redis`` client can be
+used as-is to share the cache between workers. ``MemoryBackend`` is a
+size-bounded in-process LRU and the default; with it, each worker has its
+own cache and sees other workers' writes only after the TTL expires.
+
+List endpoints go through ``cached_listing``, which answers conditional
+requests before looking the listing up in the cache.
+"""
+
+# Standard library imports
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Mapping, Optional, Protocol, Tuple
+
+# Third-party imports
+from fastapi import Request, Response
+from sqlmodel import Session
+
+# Local imports
+from app.core.config import (
+    REDIS_URL,
+    RESPONSE_CACHE_BACKEND,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_CACHE_TTL_SECONDS,
+)
+from app.core.etag import ETAG_HEADER, conditional_get
+from app.core.metrics import Counter, Gauge
+from app.core.pagination import NEXT_CURSOR_HEADER
+
+# Response headers that are part of a cached listing.
+CACHED_HEADERS = (NEXT_CURSOR_HEADER, ETAG_HEADER)
+
+
+class CacheBackend(Protocol):
+    """The Redis-compatible operations the response cache relies on."""
+
+    def get(self, key: str) -> Optional[bytes]: ...
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> object: ...
+
+    def incr(self, key: str) -> int: ...
+
+
+class MemoryBackend:
+    """An in-process LRU bounded by the total size of the cached values."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[bytes, float]]" = OrderedDict()
+        # Generation counters live apart from the LRU: evicting one would reset
+        # it and could resurrect entries stored under an old generation.
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None) -> bool:
+        expires_at = time.monotonic() + ex if ex else float("inf")
+        with self._lock:
+            self._remove(key)
+            if len(value) > self.max_bytes:
+                return False
+            self._entries[key] = (value, expires_at)
+            self.size_bytes += len(value)
+            while self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+        return True
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+            self.size_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= len(entry[0])
+
+
+class ResponseCache:
+    """Caches serialized listing responses per user."""
+
+    def __init__(self, backend: CacheBackend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+
+    def key_for(
+        self,
+        username: str,
+        request: Request,
+        depends_on: Iterable[str],
+        version: str = "",
+    ) -> str:
+        """
+        Build the cache key of a listing request.
+
+        Must be called before the data is read, so that a write committed
+        while the response is being built invalidates it. ``version`` (the
+        listing's ETag) is made part of the key, so a cached body is never
+        served with the ETag of newer data.
+        """
+        generations = ",".join(
+            (self.backend.get(f"gen:{username}:{entity}") or b"0").decode()
+            for entity in depends_on
+        )
+        query = "&".join(sorted(request.url.query.split("&")))
+        return f"resp:{username}:{generations}{version}:{request.url.path}?{query}"
+
+    def get(self, key: str) -> Optional[Response]:
+        """Return the cached response for ``key``, or None on a miss."""
+        endpoint = key.rsplit("?", 1)[0].rsplit(":", 1)[1]
+        value = self.backend.get(key)
+        if value is None:
+            response_cache_misses_total.inc(endpoint=endpoint)
+            return None
+        response_cache_hits_total.inc(endpoint=endpoint)
+        raw_headers, body = value.split(b"\n", 1)
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers=json.loads(raw_headers),
+        )
+
+    def put(self, key: str, body: bytes, headers: Mapping[str, str]) -> Response:
+        """Store a serialized JSON body and its ``CACHED_HEADERS``, and return it."""
+        headers = {name: headers[name] for name in CACHED_HEADERS if name in headers}
+        raw_headers = json.dumps(headers).encode()
+        self.backend.set(key, raw_headers + b"\n" + body, ex=self.ttl)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def invalidate(self, username: str, entities: Iterable[str]) -> None:
+        """Invalidate the user's cached responses that depend on ``entities``."""
+        for entity in entities:
+            self.backend.incr(f"gen:{username}:{entity}")
+
+    def clear(self) -> None:
+        """Drop everything (only supported by the in-memory backend)."""
+        self.backend.clear()
+
+
+def _create_backend() -> CacheBackend:
+    if RESPONSE_CACHE_BACKEND == "redis":
+        import redis  # pylint: disable=import-outside-toplevel
+
+        return redis.Redis.from_url(REDIS_URL)
+    return MemoryBackend(max_bytes=RESPONSE_CACHE_MAX_BYTES)
+
+
+response_cache = ResponseCache(_create_backend(), ttl=RESPONSE_CACHE_TTL_SECONDS)
+
+
+def cached_listing(
+    request: Request,
+    response: Response,
+    session: Session,
+    username: str,
+    depends_on: Iterable[str],
+) -> Tuple[Optional[Response], str]:
+    """
+    Look up a listing by ETag, then in the response cache.
+
+    Sets the ETag on ``response``. Returns the response to send right away
+    (304 Not Modified or the cached listing) or None, together with the key
+    to ``put`` the freshly built listing under.
+    """
+    depends_on = tuple(depends_on)
+    unchanged = conditional_get(request, response, session, username, depends_on)
+    if unchanged is not None:
+        return unchanged, ""
+    cache_key = response_cache.key_for(
+        username, request, depends_on, version=response.headers[ETAG_HEADER]
+    )
+    return response_cache.get(cache_key), cache_key
+
+
+response_cache_hits_total = Counter(
+    "response_cache_hits_total",
+    "Listing requests served from the response cache",
+    ("endpoint",),
+)
+response_cache_misses_total = Counter(
+    "response_cache_misses_total",
+    "Listing requests that missed the response cache",
+    ("endpoint",),
+)
+Gauge(
+    "response_cache_size_bytes",
+    "Bytes held by the in-memory response cache",
+    function=lambda: getattr(response_cache.backend, "size_bytes", 0),
+)
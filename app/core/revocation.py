@@ -0,0 +1,151 @@
+"""
+Access token revocation.
+
+Every access token carries a unique ``jti`` claim. Revoking a token records
+its ``jti`` until the token's ``exp`` in two places:
+
+- the ``RevokedToken`` table, which every worker process shares, and
+- an in-process ``RevocationList``, which authenticated requests check.
+
+The check is a single set membership test, so it costs the same on a token
+cache hit as on a miss and allocates nothing. Entries are grouped into
+expiry buckets of ``BUCKET_SECONDS``; whole buckets are dropped once their
+tokens can no longer be presented, so the set only holds revocations that
+still matter.
+
+Each worker loads the table on startup and then polls it for revocations
+made by other workers every ``REVOCATION_SYNC_SECONDS``, piggybacking on an
+authenticated request's session; a token revoked elsewhere is therefore
+rejected everywhere within that interval. Expired rows are pruned whenever a
+token is revoked.
+"""
+
+# Standard library imports
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Set
+
+# Third-party imports
+from sqlalchemy import delete, select
+from sqlmodel import Session
+
+# Local imports
+from app.core.config import REVOCATION_SYNC_SECONDS
+from app.core.metrics import Gauge
+from app.models import RevokedToken, utcnow
+
+BUCKET_SECONDS = 60
+
+# Expiry recorded for tokens issued without an ``exp`` claim.
+NEVER_EXPIRES = datetime(9999, 1, 1, tzinfo=timezone.utc).timestamp()
+
+# Revocations committed this long before a sync may still become visible after
+# it, because their transaction committed later; each sync re-reads them.
+SYNC_OVERLAP = timedelta(seconds=2)
+
+
+def _as_datetime(expires_at: float) -> datetime:
+    return datetime.fromtimestamp(expires_at, timezone.utc).replace(tzinfo=None)
+
+
+def _as_timestamp(expires_at: datetime) -> float:
+    return expires_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+class RevocationList:
+    """A thread-safe set of revoked token ids that forgets expired tokens."""
+
+    def __init__(self, sync_interval: float):
+        self.sync_interval = sync_interval
+        self._revoked: Set[str] = set()
+        self._buckets: Dict[int, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._synced_through: Optional[datetime] = None
+        self._next_sync = time.monotonic() + sync_interval
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def is_revoked(self, jti: str) -> bool:
+        """Whether the token with id ``jti`` has been revoked."""
+        return jti in self._revoked
+
+    def add(self, jti: str, expires_at: float) -> None:
+        """Remember ``jti`` as revoked until ``expires_at`` (epoch seconds)."""
+        now = time.time()
+        if expires_at <= now:
+            return
+        # Round up, so a bucket is only dropped after all of its tokens expired.
+        bucket = int(expires_at // BUCKET_SECONDS) + 1
+        with self._lock:
+            self._drop_expired(now)
+            self._buckets.setdefault(bucket, set()).add(jti)
+            self._revoked.add(jti)
+
+    def revoke(self, session: Session, jti: str, expires_at: float) -> None:
+        """
+        Revoke ``jti`` in this worker and, once committed, in every worker.
+
+        Args:
+            session: The session whose transaction records the revocation
+            jti: The id of the revoked token
+            expires_at: The token's ``exp`` claim (epoch seconds)
+        """
+        now = utcnow()
+        session.execute(delete(RevokedToken).where(RevokedToken.expires_at <= now))
+        session.merge(
+            RevokedToken(jti=jti, expires_at=_as_datetime(expires_at), revoked_at=now)
+        )
+        self.add(jti, expires_at)
+
+    def maybe_sync(self, session: Session) -> None:
+        """Pick up other workers' revocations if the sync interval has passed."""
+        if time.monotonic() < self._next_sync:
+            return
+        # One request per worker syncs; the others keep using the current set.
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.sync(session)
+        finally:
+            self._sync_lock.release()
+
+    def sync(self, session: Session) -> None:
+        """Load the revocations recorded since the last sync (all on the first)."""
+        started = utcnow()
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > started
+        )
+        if self._synced_through is not None:
+            query = query.where(
+                RevokedToken.revoked_at >= self._synced_through - SYNC_OVERLAP
+            )
+        for jti, expires_at in session.execute(query):
+            self.add(jti, _as_timestamp(expires_at))
+        self._synced_through = started
+        self._next_sync = time.monotonic() + self.sync_interval
+
+    def clear(self) -> None:
+        with self._lock:
+            self._revoked.clear()
+            self._buckets.clear()
+        self._synced_through = None
+        self._next_sync = time.monotonic() + self.sync_interval
+
+    def _drop_expired(self, now: float) -> None:
+        current = int(now // BUCKET_SECONDS)
+        for bucket in [bucket for bucket in self._buckets if bucket <= current]:
+            # Replace rather than mutate the set, so that concurrent lock-free
+            # readers never see it change size mid-lookup.
+            self._revoked = self._revoked - self._buckets.pop(bucket)
+
+
+revocation_list = RevocationList(sync_interval=REVOCATION_SYNC_SECONDS)
+
+Gauge(
+    "revoked_tokens",
+    "Unexpired revoked tokens known to this worker",
+    function=lambda: len(revocation_list),
+)
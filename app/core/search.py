@@ -0,0 +1,118 @@
+"""
+Full-text search over todo content.
+
+On SQLite, todos are indexed by the ``todo_fts`` FTS5 table (created by a
+migration). It is an external-content index over the ``todo`` table, kept in
+sync by triggers on insert, update and delete, so every write path (ORM, bulk
+statements, raw SQL) maintains it. The owner's username is indexed alongside
+the content so that a search only walks that user's postings; matches are
+ranked with bm25 on the content.
+
+Other databases fall back to a case-insensitive substring match ordered by
+recency, which is correct but not indexed.
+
+The index is keyed by the todo table's implicit rowid. ``VACUUM`` may
+renumber rowids, so run ``INSERT INTO todo_fts(todo_fts) VALUES('rebuild')``
+after vacuuming.
+"""
+
+# Standard library imports
+from typing import List
+
+# Third-party imports
+from sqlalchemy import Connection, text
+from sqlmodel import Session, select
+
+# Local imports
+from app.models import Todo
+
+FTS_TABLE = "todo_fts"
+
+_FTS_SCHEMA = [
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "content, username, content='todo', content_rowid='rowid')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON todo BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, content, username) "
+    "VALUES (new.rowid, new.content, new.username); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON todo BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, username) "
+    "VALUES ('delete', old.rowid, old.content, old.username); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au "
+    "AFTER UPDATE OF content, username ON todo BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, content, username) "
+    "VALUES ('delete', old.rowid, old.content, old.username); "
+    f"INSERT INTO {FTS_TABLE}(rowid, content, username) "
+    "VALUES (new.rowid, new.content, new.username); END",
+]
+
+_FTS_SEARCH = text(
+    f"SELECT todo.* FROM {FTS_TABLE} JOIN todo ON todo.rowid = {FTS_TABLE}.rowid "
+    f"WHERE {FTS_TABLE} MATCH :match AND todo.username = :username "
+    f"ORDER BY bm25({FTS_TABLE}, 1.0, 0.0), todo.rowid "
+    "LIMIT :limit OFFSET :offset"
+)
+
+
+def create_search_index(connection: Connection) -> None:
+    """Create and populate the FTS index (SQLite only; idempotent)."""
+    if connection.dialect.name != "sqlite":
+        return
+    for statement in _FTS_SCHEMA:
+        connection.execute(text(statement))
+    connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def match_expression(username: str, query: str) -> str:
+    """
+    Build the FTS5 query for a user's search string.
+
+    Every word must match; the last one also matches as a prefix, so results
+    follow the user as they type. Words are quoted, so FTS5 operators typed
+    by the user are searched for literally.
+    """
+    terms = [_quote(term) for term in query.split()]
+    terms[-1] += "*"
+    return f"username:{_quote(username)} AND content:({' '.join(terms)})"
+
+
+def search_todos(
+    session: Session, username: str, query: str, limit: int, offset: int
+) -> List[Todo]:
+    """
+    Return one page of the user's todos matching ``query``, best first.
+
+    Args:
+        session: The database session
+        username: The owner of the todos to search
+        query: The words to search for (must not be blank)
+        limit: The maximum number of todos to return
+        offset: The number of matches to skip
+
+    Returns:
+        List[Todo]: The matching todos
+    """
+    if session.get_bind().dialect.name == "sqlite":
+        statement = select(Todo).from_statement(
+            _FTS_SEARCH.bindparams(
+                match=match_expression(username, query),
+                username=username,
+                limit=limit,
+                offset=offset,
+            )
+        )
+        return list(session.execute(statement).scalars())
+
+    # pylint: disable=no-member
+    statement = (
+        select(Todo)
+        .where(Todo.username == username, Todo.content.icontains(query.strip()))
+        .order_by(Todo.created_at.desc(), Todo.id)
+        .limit(limit)
+        .offset(offset)
+    )
+    # pylint: enable=no-member
+    return list(session.exec(statement).all())
@@ -1,24 +1,45 @@
+import hashlib
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Optional
+from uuid import uuid4
 from fastapi import Depends, HTTPException, status
-from jose import jwt, JWTError
-from passlib.context import CryptContext
+from fastapi.concurrency import run_in_threadpool
 from sqlmodel import Session, select
 from app.models import User, UserCreate
 from app.core.dependency import oauth2_scheme
-from app.db.database import get_db
+from app.core.hashing import hashing_pool
+from app.core.revocation import NEVER_EXPIRES, revocation_list
+from app.core.token_cache import token_cache
+from app.db.database import get_db, get_replica_db
 
 from app.core.config import SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# passlib/bcrypt and python-jose (which loads cryptography) are slow to import,
+# so they are imported on first use instead of when the app starts.
+# pylint: disable=import-outside-toplevel
+
+
+@lru_cache(maxsize=None)
+def _pwd_context():
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+@lru_cache(maxsize=None)
+def _jwt():
+    from jose import jwt
+
+    return jwt
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _pwd_context().hash(password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -30,29 +51,52 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
             minutes=ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    to_encode.setdefault("jti", uuid4().hex)
+    encoded_jwt = _jwt().encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+def token_id(payload: dict, token: str) -> str:
+    """Return the token's ``jti``, or a digest of tokens issued without one."""
+    return payload.get("jti") or hashlib.sha256(token.encode()).hexdigest()
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+
 def get_user(db: Session, username: str) -> Optional[User]:
     return db.exec(select(User).where(User.username == username)).first()
 
 
-def authenticate_user(db: Session, username: str, password: str) -> Optional[User]:
-    user = get_user(db, username)
+async def authenticate_user(
+    db: Session, username: str, password: str
+) -> Optional[User]:
+    user = await run_in_threadpool(get_user, db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await hashing_pool.run(verify_password, password, user.hashed_password):
         return None
     return user
 
 
-def create_user(db: Session, user: UserCreate) -> User:
-    existing_user = get_user(db, user.username)
+def _save_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+async def create_user(db: Session, user: UserCreate) -> User:
+    existing_user = await run_in_threadpool(get_user, db, user.username)
     if existing_user:
         raise HTTPException(status_code=400, detail="Username already registered")
 
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await hashing_pool.run(get_password_hash, user.password)
     db_user = User(
         username=user.username,
         name=user.name,
@@ -60,36 +104,50 @@ def create_user(db: Session, user: UserCreate) -> User:
         disabled=False,
     )
 
-    db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
-    return db_user
+    return await run_in_threadpool(_save_user, db, db_user)
 
 
-async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+    replica_db: Session = Depends(get_replica_db),
 ) -> User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+    revocation_list.maybe_sync(db)
+    cached = token_cache.get_entry(token)
+    if cached is not None:
+        if revocation_list.is_revoked(cached.jti):
+            raise _credentials_exception()
+        return cached.user
+
+    credentials_exception = _credentials_exception()
 
+    jwt = _jwt()
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
             raise credentials_exception
-    except JWTError:
+    except jwt.JWTError:
+        raise credentials_exception
+
+    jti = token_id(payload, token)
+    if revocation_list.is_revoked(jti):
         raise credentials_exception
 
-    user = get_user(db, username)
+    # Users are looked up on the replica; a user registered moments ago may
+    # not have replicated yet, so fall back to the primary before giving up.
+    user = get_user(replica_db, username) or get_user(db, username)
     if user is None:
         raise credentials_exception
+
+    # Cache a detached copy: the session's instance is expired by any commit
+    # the route handler makes and cannot be reloaded once the session closes.
+    user = User.model_validate(user.model_dump())
+    token_cache.put(token, user, payload.get("exp") or float("inf"), jti)
     return user
 
 
-async def get_current_active_user(
+def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     if current_user.disabled:
@@ -98,16 +156,32 @@ async def get_current_active_user(
 
 
 def verify_token(token: str) -> bool:
+    jwt = _jwt()
     try:
-        jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return True
-    except JWTError:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.JWTError:
         return False
+    return not revocation_list.is_revoked(token_id(payload, token))
 
 
-def revoke_token(token: str) -> None:
-    pass
+def revoke_token(db: Session, token: str) -> None:
+    jwt = _jwt()
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except jwt.JWTError:
+        # Invalid and expired tokens are rejected anyway.
+        return
+    revocation_list.revoke(
+        db, token_id(payload, token), payload.get("exp") or NEVER_EXPIRES
+    )
+    db.commit()
+    token_cache.invalidate_token(token)
 
 
 def is_token_revoked(token: str) -> bool:
-    return False
+    jwt = _jwt()
+    try:
+        payload = jwt.get_unverified_claims(token)
+    except jwt.JWTError:
+        return False
+    return revocation_list.is_revoked(token_id(payload, token))
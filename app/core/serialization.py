@@ -0,0 +1,111 @@
+"""
+Fast JSON encoding.
+
+``dumps`` encodes with orjson when it is installed and falls back to the
+standard library otherwise; both produce compact UTF-8 JSON with dates and
+datetimes in ISO 8601, the same format pydantic uses. ``JSONResponse`` is
+the app's default response class and renders through ``dumps``.
+
+``rows_json`` encodes result rows (plain tuples from a column select)
+directly, so list endpoints skip building ORM instances and validating them
+into response models when the data already came from the database.
+``project`` narrows that select to the fields a client asked for with a
+``fields=`` query parameter.
+"""
+
+# Standard library imports
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+# Third-party imports
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse as _StarletteJSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_json_default,
+    ).encode()
+
+
+def column_fields(model) -> Tuple[list, Tuple[str, ...]]:
+    """
+    Return the table columns of ``model`` and their names.
+
+    Selecting the columns returns plain rows; their names are the model's
+    field names, and therefore the keys of its JSON objects.
+    """
+    columns = list(model.__table__.columns)
+    return columns, tuple(column.name for column in columns)
+
+
+def project(
+    model, fields: Optional[str], required: Sequence[str] = ()
+) -> Tuple[list, Tuple[str, ...]]:
+    """
+    Return the columns to select for a ``fields=`` projection and their names.
+
+    ``required`` columns the caller needs itself (e.g. the pagination key)
+    are selected after the requested ones even when not requested. Only the
+    requested names are returned, and ``rows_json`` zips names with row
+    values, so these trailing columns are left out of the JSON.
+
+    Args:
+        model: The table model being listed
+        fields: Comma-separated field names, or None for every field
+        required: Fields that must be selected regardless
+
+    Returns:
+        tuple: The columns to select and the field names to encode
+
+    Raises:
+        HTTPException: 400 if no field or an unknown field is requested
+    """
+    columns, names = column_fields(model)
+    if fields is None:
+        return columns, names
+
+    requested = tuple(
+        dict.fromkeys(name.strip() for name in fields.split(",") if name.strip())
+    )
+    unknown = [name for name in requested if name not in names]
+    if not requested or unknown:
+        problem = f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields"
+        raise HTTPException(
+            status_code=400,
+            detail=f"{problem}. Choose from: {', '.join(names)}.",
+        )
+    by_name = dict(zip(names, columns))
+    selected = requested + tuple(name for name in required if name not in requested)
+    return [by_name[name] for name in selected], requested
+
+
+def rows_json(rows: Iterable[Sequence], fields: Sequence[str]) -> bytes:
+    """Encode rows as a JSON array of objects keyed by ``fields``."""
+    return dumps([dict(zip(fields, row)) for row in rows])
+
+
+class JSONResponse(_StarletteJSONResponse):
+    """JSON response rendered with ``dumps``."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,67 @@
+"""
+Opt-in SQL tracing.
+
+``install_sql_tracing`` hooks an engine so that, for every statement, the
+statement, its duration and the route of the request that ran it are logged
+to the ``app.sql`` logger at DEBUG level. Statements slower than the
+threshold are logged as warnings together with their query plan
+(``EXPLAIN QUERY PLAN`` on SQLite, ``EXPLAIN`` elsewhere).
+``MetricsMiddleware`` adds the per-request summary line and the
+``X-DB-Query-Count`` / ``X-DB-Time-Ms`` response headers.
+
+Enabled by ``SQL_TRACE``; the plan lookup adds a query per slow statement,
+so this is meant for debugging rather than for normal production use.
+"""
+
+# Standard library imports
+import logging
+
+# Third-party imports
+from sqlalchemy import Engine, event
+
+# Local imports
+from app.core.config import SLOW_QUERY_MS
+from app.core.request_metrics import current_request, query_seconds
+
+logger = logging.getLogger("app.sql")
+
+
+def _explain(connection, statement: str, parameters) -> str:
+    """Return the query plan of ``statement`` as text, or why it is missing."""
+    prefix = (
+        "EXPLAIN QUERY PLAN " if connection.dialect.name == "sqlite" else "EXPLAIN "
+    )
+    # A raw DBAPI cursor, so the plan lookup isn't traced (or counted) itself.
+    cursor = connection.connection.dbapi_connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        return "\n".join(
+            "  " + " | ".join(str(column) for column in row)
+            for row in cursor.fetchall()
+        )
+    except Exception as exc:  # pylint: disable=broad-except
+        return f"  (no plan: {exc})"
+    finally:
+        cursor.close()
+
+
+def _trace(connection, _cursor, statement, parameters, context, executemany):
+    elapsed_ms = query_seconds(context) * 1000
+    stats = current_request.get()
+    endpoint = stats.endpoint if stats is not None else "(no request)"
+    logger.debug("%s: %.2f ms: %s", endpoint, elapsed_ms, statement)
+    if elapsed_ms >= SLOW_QUERY_MS:
+        plan = (
+            "  (executemany)"
+            if executemany
+            else _explain(connection, statement, parameters)
+        )
+        logger.warning(
+            "Slow query on %s (%.2f ms): %s\n%s", endpoint, elapsed_ms, statement, plan
+        )
+
+
+def install_sql_tracing(db_engine: Engine) -> None:
+    """Trace every statement executed through ``db_engine``."""
+    if not event.contains(db_engine, "after_cursor_execute", _trace):
+        event.listen(db_engine, "after_cursor_execute", _trace)
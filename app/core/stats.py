@@ -0,0 +1,184 @@
+"""
+Todo statistics.
+
+Statistics are computed in SQL either straight from the todo table with
+GROUP BY queries (``compute_stats``), or from materialized counters
+(``read_stats``) that cost O(categories + days) to read however many todos
+the user has.
+
+The counters live in ``categorytodocount`` and ``daytodocount``. Write paths
+report the todos they add and remove with ``count_todos``, and the net
+changes are applied with upserts when the transaction commits (in the same
+transaction), so the counters never drift from the rows they describe.
+Migration 5 backfills them for existing data.
+"""
+
+# Standard library imports
+from collections import defaultdict
+from datetime import date
+from typing import Iterable, Optional, Tuple
+
+# Third-party imports
+from sqlalchemy import Connection, case, delete, event, func, insert, literal
+from sqlalchemy.orm import Session
+from sqlmodel import select
+
+# Local imports
+from app.db.counters import increment
+from app.models import (
+    CategoryStats,
+    CategoryTodoCount,
+    DayStats,
+    DayTodoCount,
+    Todo,
+    TodoStats,
+)
+
+_COUNTS_KEY = "todo_counts"
+
+# What a todo contributes to the counters: (category_id, created_at, completed)
+TodoKey = Tuple[Optional[str], date, bool]
+
+
+def todo_key(todo: Todo) -> TodoKey:
+    """Return the fields of a todo that the counters depend on."""
+    return (todo.category_id, todo.created_at, bool(todo.completed))
+
+
+def count_todos(
+    session: Session, username: str, keys: Iterable[TodoKey], sign: int = 1
+) -> None:
+    """
+    Record todos added (``sign=1``) or removed (``sign=-1``) by a transaction.
+
+    An update is a removal of the old values plus an addition of the new ones.
+
+    Args:
+        session: The session that makes the change
+        username: The owner of the todos
+        keys: The ``todo_key`` of every todo added or removed
+        sign: 1 for added todos, -1 for removed ones
+    """
+    counts = session.info.setdefault(_COUNTS_KEY, {}).setdefault(
+        username, defaultdict(lambda: [0, 0])
+    )
+    for category_id, created_at, completed in keys:
+        for key in (("category", category_id or ""), ("day", created_at)):
+            counts[key][0] += sign
+            counts[key][1] += sign * int(completed)
+
+
+@event.listens_for(Session, "before_commit")
+def _apply_counts(session: Session) -> None:
+    rows = {"category": [], "day": []}
+    for username, counts in sorted(session.info.pop(_COUNTS_KEY, {}).items()):
+        for (kind, value), (total, completed) in counts.items():
+            if total or completed:
+                rows[kind].append(
+                    {
+                        "username": username,
+                        "category_id" if kind == "category" else "day": value,
+                        "total": total,
+                        "completed": completed,
+                    }
+                )
+    # Sorted, so that concurrent transactions lock the rows in the same order.
+    increment(
+        session,
+        CategoryTodoCount,
+        ("username", "category_id"),
+        sorted(rows["category"], key=lambda row: row["category_id"]),
+    )
+    increment(
+        session,
+        DayTodoCount,
+        ("username", "day"),
+        sorted(rows["day"], key=lambda row: row["day"]),
+    )
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_counts(session: Session, _previous_transaction) -> None:
+    session.info.pop(_COUNTS_KEY, None)
+
+
+def _build_stats(category_rows, day_rows) -> TodoStats:
+    categories = [
+        CategoryStats(category_id=category_id or None, total=total, completed=done)
+        for category_id, total, done in category_rows
+        if total
+    ]
+    return TodoStats(
+        total=sum(category.total for category in categories),
+        completed=sum(category.completed for category in categories),
+        categories=categories,
+        days=[
+            DayStats(day=day, total=total, completed=done)
+            for day, total, done in day_rows
+            if total
+        ],
+    )
+
+
+def compute_stats(session: Session, username: str) -> TodoStats:
+    """Compute a user's statistics from the todo table with GROUP BY."""
+    completed = func.sum(case((Todo.completed, 1), else_=0))
+    # pylint: disable=no-member
+    category_rows = session.exec(
+        select(Todo.category_id, func.count(), completed)
+        .where(Todo.username == username)
+        .group_by(Todo.category_id)
+        .order_by(Todo.category_id)
+    ).all()
+    day_rows = session.exec(
+        select(Todo.created_at, func.count(), completed)
+        .where(Todo.username == username)
+        .group_by(Todo.created_at)
+        .order_by(Todo.created_at)
+    ).all()
+    # pylint: enable=no-member
+    return _build_stats(category_rows, day_rows)
+
+
+def read_stats(session: Session, username: str) -> TodoStats:
+    """Read a user's statistics from the materialized counters."""
+    category_rows = session.exec(
+        select(
+            CategoryTodoCount.category_id,
+            CategoryTodoCount.total,
+            CategoryTodoCount.completed,
+        )
+        .where(CategoryTodoCount.username == username)
+        .order_by(CategoryTodoCount.category_id)
+    ).all()
+    day_rows = session.exec(
+        select(DayTodoCount.day, DayTodoCount.total, DayTodoCount.completed)
+        .where(DayTodoCount.username == username)
+        .order_by(DayTodoCount.day)
+    ).all()
+    return _build_stats(category_rows, day_rows)
+
+
+def backfill_counters(connection: Connection) -> None:
+    """Rebuild every user's counters from the todo table (idempotent)."""
+    todo = Todo.__table__
+    completed = func.sum(case((todo.c.completed, 1), else_=0))
+    category_key = func.coalesce(todo.c.category_id, literal(""))
+    connection.execute(delete(CategoryTodoCount))
+    connection.execute(delete(DayTodoCount))
+    connection.execute(
+        insert(CategoryTodoCount).from_select(
+            ["username", "category_id", "total", "completed"],
+            select(todo.c.username, category_key, func.count(), completed).group_by(
+                todo.c.username, category_key
+            ),
+        )
+    )
+    connection.execute(
+        insert(DayTodoCount).from_select(
+            ["username", "day", "total", "completed"],
+            select(
+                todo.c.username, todo.c.created_at, func.count(), completed
+            ).group_by(todo.c.username, todo.c.created_at),
+        )
+    )
@@ -0,0 +1,123 @@
+"""
+Verified-token cache.
+
+Authenticated requests resolve their bearer token to a ``User`` with a JWT
+decode plus a database lookup. This module keeps the result in a bounded,
+in-process LRU keyed by the SHA-256 digest of the token, so repeat requests
+with the same token skip both. Entries expire at the token's ``exp`` claim or
+after ``TOKEN_CACHE_TTL_SECONDS``, whichever comes first, and can be dropped
+explicitly per token (revocation) or per user (disabled accounts). Each entry
+keeps the token's id so that revocation can still be checked on a hit.
+"""
+
+# Standard library imports
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set
+
+# Local imports
+from app.core.config import TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS
+from app.core.metrics import Counter, Gauge
+from app.models import User
+
+
+class CachedToken(NamedTuple):
+    user: User
+    expires_at: float
+    jti: str
+
+
+def _digest(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """A thread-safe LRU of verified tokens with per-entry expiry."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, CachedToken]" = OrderedDict()
+        self._by_username: Dict[str, Set[bytes]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[User]:
+        """Return the cached user for ``token`` or None on a miss."""
+        entry = self.get_entry(token)
+        return entry.user if entry is not None else None
+
+    def get_entry(self, token: str) -> Optional[CachedToken]:
+        """Return the cache entry for ``token`` or None on a miss."""
+        key = _digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.time():
+                self._entries.move_to_end(key)
+                token_cache_hits_total.inc()
+                return entry
+            if entry is not None:
+                self._remove(key)
+        token_cache_misses_total.inc()
+        return None
+
+    def put(self, token: str, user: User, expires_at: float, jti: str = "") -> None:
+        """Cache ``user`` for ``token`` until ``expires_at`` (epoch seconds)."""
+        if self.max_size <= 0:
+            return
+        key = _digest(token)
+        expires_at = min(expires_at, time.time() + self.ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CachedToken(user, expires_at, jti)
+            self._by_username.setdefault(user.username, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+                token_cache_evictions_total.inc()
+
+    def invalidate_token(self, token: str) -> None:
+        """Drop the cached entry for ``token``, e.g. when it is revoked."""
+        with self._lock:
+            self._remove(_digest(token))
+
+    def invalidate_user(self, username: str) -> None:
+        """Drop every cached token of ``username``, e.g. when it is disabled."""
+        with self._lock:
+            for key in list(self._by_username.get(username, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_username.clear()
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_username.get(entry.user.username)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_username[entry.user.username]
+
+
+token_cache = TokenCache(max_size=TOKEN_CACHE_SIZE, ttl=TOKEN_CACHE_TTL_SECONDS)
+
+token_cache_hits_total = Counter(
+    "token_cache_hits_total", "Authenticated requests served from the token cache"
+)
+token_cache_misses_total = Counter(
+    "token_cache_misses_total", "Authenticated requests that missed the token cache"
+)
+token_cache_evictions_total = Counter(
+    "token_cache_evictions_total", "Token cache entries evicted to respect its size"
+)
+Gauge(
+    "token_cache_size", "Entries in the token cache", function=lambda: len(token_cache)
+)
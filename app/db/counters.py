@@ -0,0 +1,61 @@
+"""
+Counter upserts.
+
+Version numbers and materialized statistics are kept as counter columns that
+concurrent transactions add to. ``increment`` does that without a read and
+without racing to create the row.
+"""
+
+from typing import List, Sequence
+
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def increment(
+    session: Session, model, key_columns: Sequence[str], rows: List[dict]
+) -> None:
+    """
+    Add to counter columns of rows, creating the rows that don't exist.
+
+    On SQLite and PostgreSQL all rows go through one executemany upsert, so
+    the statement is compiled once however many rows change.
+
+    Args:
+        session: The session whose transaction makes the change
+        model: The table model holding the counters
+        key_columns: The primary key columns of the table
+        rows: One dict per row: its key values and the amount to add to
+            each counter column (every dict must have the same columns)
+    """
+    if not rows:
+        return
+    counters = [column for column in rows[0] if column not in key_columns]
+
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        statement = dialect_insert(model)
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(key_columns),
+                set_={
+                    column: getattr(model, column) + statement.excluded[column]
+                    for column in counters
+                },
+            ),
+            rows,
+        )
+        return
+
+    for row in rows:
+        updated = session.execute(
+            update(model)
+            .where(*(getattr(model, column) == row[column] for column in key_columns))
+            .values(
+                {column: getattr(model, column) + row[column] for column in counters}
+            )
+        )
+        if updated.rowcount == 0:
+            session.add(model(**row))
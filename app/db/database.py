@@ -1,16 +1,149 @@
-from sqlmodel import create_engine, Session, SQLModel
+"""
+Database engine and session management.
 
-sqlite_file_name = "database.db"
-sqlite_url = f"sqlite:///{sqlite_file_name}"
+``create_db_engine`` builds the engine for a database URL. SQLite databases
+get production pragmas (WAL journal, ``synchronous=NORMAL``, busy timeout,
+page cache and memory-mapped I/O) applied to every new connection; any other
+URL, such as PostgreSQL, gets a plain pooled engine with pre-ping. Pool sizes
+and pragmas come from ``app.core.config``.
 
-connect_args = {"check_same_thread": False}
-engine = create_engine(sqlite_url, connect_args=connect_args)
+``engine`` is the primary, which takes every write. ``read_engine`` points at
+``READ_REPLICA_URL`` when one is configured and is the primary otherwise.
+``record_write`` and ``wrote_recently`` track each user's last write so that
+read routing can keep their reads on the primary for a short window.
+
+A forked worker process must not use connections its parent opened, so
+``dispose_engines`` runs in every child right after a fork.
+"""
+
+import os
+import threading
+import time
+from typing import Dict
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import make_url
+from sqlmodel import create_engine, Session
+
+from app.core.config import (
+    DATABASE_URL,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT_SECONDS,
+    READ_REPLICA_URL,
+    READ_YOUR_WRITES_SECONDS,
+    SQLITE_BUSY_TIMEOUT_MS,
+    SQLITE_CACHE_SIZE_KB,
+    SQLITE_JOURNAL_MODE,
+    SQLITE_MMAP_SIZE,
+    SQLITE_SYNCHRONOUS,
+)
+from app.db.migrations import migrate
+
+
+def _apply_sqlite_pragmas(dbapi_connection, _connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS:d}")
+        # A negative cache_size is a size in KiB rather than a page count.
+        cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB:d}")
+        cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE:d}")
+    finally:
+        cursor.close()
+
+
+def create_db_engine(url: str = DATABASE_URL, **kwargs) -> Engine:
+    """
+    Create an engine for ``url`` tuned for this application.
+
+    Args:
+        url: The database URL
+        **kwargs: Extra ``create_engine`` arguments, overriding the defaults
+
+    Returns:
+        Engine: The configured engine
+    """
+    database_url = make_url(url)
+    is_sqlite = database_url.get_backend_name() == "sqlite"
+    in_memory = is_sqlite and database_url.database in (None, "", ":memory:")
+    options = {}
+
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+        if not in_memory:
+            options.update(
+                pool_size=DB_POOL_SIZE,
+                max_overflow=DB_MAX_OVERFLOW,
+                pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+            )
+    else:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+            pool_pre_ping=True,
+        )
+
+    options.update(kwargs)
+    db_engine = create_engine(database_url, **options)
+
+    if is_sqlite and not in_memory:
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+
+    return db_engine
+
+
+engine = create_db_engine()
+read_engine = create_db_engine(READ_REPLICA_URL) if READ_REPLICA_URL else engine
+
+
+def dispose_engines() -> None:
+    """Forget pooled connections inherited from a parent process."""
+    # close=False leaves the parent's connections open for the parent to use.
+    engine.dispose(close=False)
+    if read_engine is not engine:
+        read_engine.dispose(close=False)
+
+
+os.register_at_fork(after_in_child=dispose_engines)
+
+_last_write: Dict[str, float] = {}
+_last_write_lock = threading.Lock()
+
+
+def record_write(username: str) -> None:
+    """Remember that ``username`` just committed a write on the primary."""
+    now = time.monotonic()
+    with _last_write_lock:
+        _last_write[username] = now
+        if len(_last_write) > 10000:
+            for name, written_at in list(_last_write.items()):
+                if now - written_at >= READ_YOUR_WRITES_SECONDS:
+                    del _last_write[name]
+
+
+def wrote_recently(username: str) -> bool:
+    """Whether ``username`` wrote within the read-your-writes window."""
+    written_at = _last_write.get(username)
+    return (
+        written_at is not None
+        and time.monotonic() - written_at < READ_YOUR_WRITES_SECONDS
+    )
 
 
 def create_db_and_tables():
-    SQLModel.metadata.create_all(engine)
+    migrate(engine)
 
 
 def get_db():
+    """Yield a session on the primary database; use it for every write."""
     with Session(engine) as session:
         yield session
+
+
+def get_replica_db():
+    """Yield a session on the read replica (the primary if none is set)."""
+    with Session(read_engine) as session:
+        yield session
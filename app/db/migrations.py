@@ -0,0 +1,173 @@
+"""
+Versioned schema migrations.
+
+``create_all`` only creates missing tables; it never changes tables that
+already exist. Schema changes to existing databases (new indexes, new
+columns, ...) are therefore expressed as numbered migrations that run once,
+in order, and are recorded in the ``schema_version`` table.
+
+Every migration must be idempotent: ``migrate`` first lets ``create_all``
+build any missing table in its current shape and then applies the pending
+migrations, so a migration may find its change already in place on a fresh
+database. Each migration runs in its own short transaction, so the service
+can keep serving while they are applied at startup.
+
+Run pending migrations manually with ``python -m app.db.migrations``.
+"""
+
+# Standard library imports
+from datetime import datetime, timezone
+from typing import Callable, List, NamedTuple
+
+# Third-party imports
+from sqlalchemy import (
+    Column,
+    Connection,
+    DateTime,
+    Engine,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    inspect,
+    select,
+    text,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import SQLModel
+
+# Local imports
+from app import models  # pylint: disable=unused-import  # registers the tables
+from app.core.search import create_search_index
+from app.core.stats import backfill_counters
+
+_version_metadata = MetaData()
+
+schema_version = Table(
+    "schema_version",
+    _version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[Connection], None]
+
+
+def _create_indexes(*names: str) -> Callable[[Connection], None]:
+    """Build a migration step that creates the named model indexes."""
+
+    def upgrade(connection: Connection) -> None:
+        indexes = {
+            index.name: index
+            for table in SQLModel.metadata.tables.values()
+            for index in table.indexes
+        }
+        for name in names:
+            indexes[name].create(connection, checkfirst=True)
+
+    return upgrade
+
+
+def _add_updated_at(connection: Connection) -> None:
+    """Add ``updated_at`` to todos and categories, backfilled with the time."""
+    column_type = DateTime().compile(dialect=connection.dialect)
+    now = models.utcnow()
+    for table in ("todo", "category"):
+        columns = {column["name"] for column in inspect(connection).get_columns(table)}
+        if "updated_at" not in columns:
+            connection.execute(
+                text(f"ALTER TABLE {table} ADD COLUMN updated_at {column_type}")
+            )
+        connection.execute(
+            text(f"UPDATE {table} SET updated_at = :now WHERE updated_at IS NULL"),
+            {"now": now},
+        )
+    _create_indexes("ix_todo_username_updated_at", "ix_category_username_updated_at")(
+        connection
+    )
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(
+        1,
+        "Index usernames and todo categories",
+        _create_indexes(
+            "ix_user_username",
+            "ix_category_username",
+            "ix_todo_username_category_id",
+            "ix_todo_category_id",
+        ),
+    ),
+    Migration(
+        2,
+        "Index keyset pagination and todo filters",
+        _create_indexes(
+            "ix_todo_username_created_at_id",
+            "ix_todo_username_completed",
+            "ix_category_username_created_at_id",
+        ),
+    ),
+    Migration(3, "Track updated_at on todos and categories", _add_updated_at),
+    Migration(4, "Full-text index on todo content", create_search_index),
+    Migration(5, "Materialized todo counters", backfill_counters),
+]
+
+
+def current_version(connection: Connection) -> int:
+    """Return the highest applied migration version (0 for none)."""
+    versions = connection.execute(select(schema_version.c.version)).scalars().all()
+    return max(versions, default=0)
+
+
+def migrate(engine: Engine) -> int:
+    """
+    Create missing tables and apply every pending migration.
+
+    Args:
+        engine: The engine of the database to migrate
+
+    Returns:
+        int: The schema version after migrating
+    """
+    SQLModel.metadata.create_all(engine)
+    _version_metadata.create_all(engine)
+
+    with engine.connect() as connection:
+        version = current_version(connection)
+
+    for migration in MIGRATIONS:
+        if migration.version <= version:
+            continue
+        try:
+            with engine.begin() as connection:
+                if current_version(connection) >= migration.version:
+                    # Another worker applied it while we were starting up.
+                    continue
+                migration.upgrade(connection)
+                connection.execute(
+                    schema_version.insert().values(
+                        version=migration.version,
+                        description=migration.description,
+                        applied_at=datetime.now(timezone.utc),
+                    )
+                )
+        except IntegrityError:
+            # Fine if we lost the race to record this version (the change is
+            # idempotent), but a failing upgrade must stop the migration.
+            with engine.connect() as connection:
+                if current_version(connection) < migration.version:
+                    raise
+        version = migration.version
+
+    return version
+
+
+if __name__ == "__main__":
+    from app.db.database import engine
+
+    print(f"Database schema is at version {migrate(engine)}")
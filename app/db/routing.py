@@ -0,0 +1,38 @@
+"""
+Read/write session routing.
+
+Route handlers that only read depend on ``get_read_db`` and mutations depend
+on ``get_db``. A read session comes from the replica unless the current user
+wrote within the last ``READ_YOUR_WRITES_SECONDS``, in which case it comes
+from the primary so the user always sees their own changes.
+"""
+
+# Third-party imports
+from fastapi import Depends
+from sqlmodel import Session
+
+# Local imports
+from app.core.security import get_current_active_user
+from app.db.database import get_db, get_replica_db, wrote_recently
+from app.models import User
+
+
+def get_read_db(
+    current_user: User = Depends(get_current_active_user),
+    primary: Session = Depends(get_db),
+    replica: Session = Depends(get_replica_db),
+) -> Session:
+    """
+    Pick the session a read-only request should use.
+
+    Sessions only connect on first use, so the one not picked costs nothing.
+
+    Args:
+        current_user: The authenticated user making the request
+        primary: A session on the primary database
+        replica: A session on the read replica
+
+    Returns:
+        Session: The primary after a recent write by the user, else the replica
+    """
+    return primary if wrote_recently(current_user.username) else replica
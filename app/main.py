@@ -3,21 +3,42 @@ Main application module.
 
 This module initializes the FastAPI application with:
 - Database setup and lifecycle management
-- CORS middleware configuration
-- Router registration for todos, categories, and users
+- A bounded thread pool for the synchronous database handlers
+- CORS and request metrics middleware
+- Router registration for todos, categories, users, export, stats, sync,
+  events, and metrics
 """
 
 # Standard library imports
 from contextlib import asynccontextmanager
 
 # Third-party imports
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlmodel import Session
 
 # Local imports
-from app.core.config import CORS_ORIGIN
-from app.db.database import create_db_and_tables
+from app.core.config import (
+    CORS_ORIGIN,
+    DB_THREADPOOL_SIZE,
+    RUN_MIGRATIONS_ON_STARTUP,
+    SQL_TRACE,
+)
+from app.core.etag import ETAG_HEADER
+from app.core.hashing import hashing_pool
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.revocation import revocation_list
+from app.core.serialization import JSONResponse
+from app.core.request_metrics import MetricsMiddleware
+from app.core.sql_trace import install_sql_tracing
+from app.db.database import create_db_and_tables, engine, read_engine
 from app.routers.categories import router as category_router
+from app.routers.events import router as events_router
+from app.routers.export import router as export_router
+from app.routers.metrics import router as metrics_router
+from app.routers.stats import router as stats_router
+from app.routers.sync import router as sync_router
 from app.routers.todo import router as todo_router
 from app.routers.user import router as user_router
 
@@ -27,17 +48,24 @@ async def lifespan(_: FastAPI):
     """
     Manage application lifecycle.
 
-    Creates database tables on startup.
+    Applies pending migrations (unless ``RUN_MIGRATIONS_ON_STARTUP`` is off),
+    loads the revoked tokens and sizes the thread pool that runs the
+    synchronous route handlers on startup, and stops the password hashing
+    pool on shutdown.
 
     Args:
         _: The FastAPI application instance (unused)
     """
-    create_db_and_tables()
+    to_thread.current_default_thread_limiter().total_tokens = DB_THREADPOOL_SIZE
+    if RUN_MIGRATIONS_ON_STARTUP:
+        create_db_and_tables()
+    with Session(engine) as session:
+        revocation_list.sync(session)
     yield  # Application runtime
-    # Cleanup (if needed) would go here
+    hashing_pool.shutdown()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=JSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -45,8 +73,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
+app.add_middleware(MetricsMiddleware)
+
+if SQL_TRACE:
+    install_sql_tracing(engine)
+    install_sql_tracing(read_engine)
 
 app.include_router(todo_router)
 app.include_router(category_router)
 app.include_router(user_router)
+app.include_router(export_router)
+app.include_router(stats_router)
+app.include_router(sync_router)
+app.include_router(events_router)
+app.include_router(metrics_router)
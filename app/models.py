@@ -6,20 +6,34 @@ for request/response validation. Models are organized by feature (Todo, Category
 with additional models for specific use cases like updates and authentication.
 """
 
-from datetime import date
+from datetime import date, datetime, timezone
 from typing import Optional, List
 from uuid import uuid4
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 
 
+def utcnow() -> datetime:
+    """Return the current UTC time as a naive datetime, as stored in the DB."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class Category(SQLModel, table=True):
     """Database and API model for categories."""
 
+    __table_args__ = (
+        Index("ix_category_username_created_at_id", "username", "created_at", "id"),
+        Index("ix_category_username_updated_at", "username", "updated_at"),
+    )
+
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     name: str
     created_at: date
-    username: str
+    updated_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow}
+    )
+    username: str = Field(index=True)
     todos: List["Todo"] = Relationship(back_populates="category")
 
 
@@ -42,12 +56,33 @@ class CategoryWithTodos(SQLModel):
 class Todo(SQLModel, table=True):
     """Database and API model for todos."""
 
+    # Per-user listings are paged by (created_at, id) and may filter on
+    # category_id or completed, and sync reads by updated_at; each access path
+    # has a composite index that starts with username.
+    __table_args__ = (
+        Index("ix_todo_username_category_id", "username", "category_id"),
+        Index("ix_todo_username_created_at_id", "username", "created_at", "id"),
+        Index(
+            "ix_todo_username_completed",
+            "username",
+            "completed",
+            "created_at",
+            "id",
+        ),
+        Index("ix_todo_username_updated_at", "username", "updated_at"),
+    )
+
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
     username: str
     content: str
     completed: bool = Field(default=False)
     created_at: date
-    category_id: Optional[str] = Field(default=None, foreign_key="category.id")
+    updated_at: datetime = Field(
+        default_factory=utcnow, sa_column_kwargs={"onupdate": utcnow}
+    )
+    category_id: Optional[str] = Field(
+        default=None, foreign_key="category.id", index=True
+    )
     category: Optional[Category] = Relationship(back_populates="todos")
 
 
@@ -59,16 +94,120 @@ class UpdateTodo(SQLModel):
     category_id: Optional[str] = None
 
 
+class BulkUpdateTodo(UpdateTodo):
+    """Request model for one item of a bulk todo update."""
+
+    id: str
+
+
+class BulkTodoResult(SQLModel):
+    """Response model for the outcome of one item of a bulk todo request."""
+
+    id: str
+    status: int
+    detail: Optional[str] = None
+
+
+class Tombstone(SQLModel, table=True):
+    """Record of a deleted todo or category, kept for delta sync."""
+
+    __table_args__ = (
+        Index("ix_tombstone_username_deleted_at", "username", "deleted_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    username: str
+    entity: str
+    entity_id: str
+    deleted_at: datetime = Field(default_factory=utcnow)
+
+
+class DeletedItem(SQLModel):
+    """Response model for one deletion reported by delta sync."""
+
+    entity: str
+    id: str
+    deleted_at: datetime
+
+
+class SyncChanges(SQLModel):
+    """Response model for the changes since a sync cursor."""
+
+    categories: List[Category]
+    todos: List["Todo"]
+    deleted: List[DeletedItem]
+    cursor: str
+
+
+class CategoryTodoCount(SQLModel, table=True):
+    """Materialized todo counts of one category ("" for uncategorized todos)."""
+
+    username: str = Field(primary_key=True)
+    category_id: str = Field(primary_key=True)
+    total: int = Field(default=0)
+    completed: int = Field(default=0)
+
+
+class DayTodoCount(SQLModel, table=True):
+    """Materialized counts of the todos created on one day."""
+
+    username: str = Field(primary_key=True)
+    day: date = Field(primary_key=True)
+    total: int = Field(default=0)
+    completed: int = Field(default=0)
+
+
+class CategoryStats(SQLModel):
+    """Response model for the todo counts of one category."""
+
+    category_id: Optional[str]
+    total: int
+    completed: int
+
+
+class DayStats(SQLModel):
+    """Response model for the counts of the todos created on one day."""
+
+    day: date
+    total: int
+    completed: int
+
+
+class TodoStats(SQLModel):
+    """Response model for a user's todo statistics."""
+
+    total: int
+    completed: int
+    categories: List[CategoryStats]
+    days: List[DayStats]
+
+
 class User(SQLModel, table=True):
     """Database and API model for users."""
 
     id: str = Field(default_factory=lambda: str(uuid4()), primary_key=True)
-    username: str
+    username: str = Field(unique=True, index=True)
     name: str
     hashed_password: str
     disabled: Optional[bool] = Field(default=False)
 
 
+class UserDataVersion(SQLModel, table=True):
+    """Per-user change counter for one kind of data ("todo" or "category")."""
+
+    username: str = Field(primary_key=True)
+    entity: str = Field(primary_key=True)
+    version: int = Field(default=0)
+
+
+class RevokedToken(SQLModel, table=True):
+    """An access token revoked before its expiry, by its ``jti`` claim."""
+
+    jti: str = Field(primary_key=True)
+    expires_at: datetime = Field(index=True)
+    revoked_at: datetime = Field(default_factory=utcnow, index=True)
+
+
 class UserCreate(SQLModel):
     """Request model for user registration that includes plain text password."""
 
@@ -12,41 +12,77 @@ access and modify their own categories.
 """
 
 # Standard library imports
+from collections import defaultdict
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 
 # Third-party imports
+from sqlalchemy import update
 from sqlmodel import select, Session
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 
 # Local imports
+from app.core.config import DEFAULT_PAGE_SIZE
+from app.core.pagination import paginate
+from app.core.changes import mark_changed, record_deletions
+from app.core.response_cache import cached_listing, response_cache
 from app.core.security import get_current_active_user
+from app.core.serialization import project, rows_json
+from app.core.stats import count_todos
 from app.db.database import get_db
-from app.models import Category, UpdateCategory, User, CategoryWithTodos
+from app.db.routing import get_read_db
+from app.models import Category, CategoryWithTodos, Todo, UpdateCategory, User, utcnow
 
 router = APIRouter()
 
 
 @router.get("/categories", response_model=List[Category], tags=["categories"])
-async def get_categories(
+# Each parameter is injected by FastAPI.
+def get_categories(  # pylint: disable=too-many-arguments
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the last page"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum page size"),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. id,name"
+    ),
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
 ) -> List[Category]:
     """
-    Retrieve all categories for the current user.
+    Retrieve one page of categories for the current user.
+
+    Categories are ordered by creation date. When more categories remain, the
+    cursor of the next page is returned in the X-Next-Cursor response header.
+    Responses carry a weak ETag and are served from the per-user response
+    cache when possible; a matching If-None-Match gets 304 Not Modified.
+    Only the requested ``fields`` are selected and returned when given.
 
     Args:
+        request: The incoming request, used for the cache key
+        response: The outgoing response, used for the cursor and ETag headers
+        cursor: The cursor of the page to fetch, omitted for the first page
+        limit: The maximum number of categories to return (capped server-side)
+        fields: Comma-separated fields to return, all of them if omitted
         current_user: The authenticated user making the request
         session: The database session
 
     Returns:
-        List[Category]: A list of all categories belonging to the current user
+        List[Category]: A page of categories belonging to the current user
     """
-    categories = session.exec(
-        select(Category).where(Category.username == current_user.username)
-    ).all()
-    return categories
+    columns, names = project(Category, fields, required=("created_at", "id"))
+    cached, cache_key = cached_listing(
+        request, response, session, current_user.username, ("category",)
+    )
+    if cached is not None:
+        return cached
+
+    statement = select(*columns).where(Category.username == current_user.username)
+    rows = paginate(session, statement, Category, response, cursor, limit)
+    return response_cache.put(cache_key, rows_json(rows, names), response.headers)
 
 
 @router.post(
@@ -55,7 +91,7 @@ async def get_categories(
     tags=["categories"],
     status_code=201,
 )
-async def add_category(
+def add_category(
     category: Category,
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_db),
@@ -75,6 +111,7 @@ async def add_category(
         HTTPException: If the date format is invalid
     """
     category.username = current_user.username
+    category.updated_at = utcnow()
 
     category.id = (
         str(UUID(category.id)) if isinstance(category.id, UUID) else str(category.id)
@@ -91,6 +128,7 @@ async def add_category(
             ) from exc
 
     session.add(category)
+    mark_changed(session, current_user.username, "category")
     session.commit()
     session.refresh(category)
 
@@ -104,7 +142,7 @@ async def add_category(
 
 
 @router.put("/categories/{category_id}", response_model=Category, tags=["categories"])
-async def update_category(
+def update_category(
     category_id: str,
     updated_category: UpdateCategory,
     current_user: User = Depends(get_current_active_user),
@@ -139,13 +177,14 @@ async def update_category(
     if updated_category.name:
         category.name = updated_category.name
 
+    mark_changed(session, current_user.username, "category")
     session.commit()
     session.refresh(category)
     return category
 
 
 @router.delete("/categories/{category_id}", tags=["categories"])
-async def delete_category(
+def delete_category(
     category_id: str,
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_db),
@@ -153,6 +192,8 @@ async def delete_category(
     """
     Delete a category.
 
+    Its todos are kept and become uncategorized.
+
     Args:
         category_id: The ID of the category to delete
         current_user: The authenticated user making the request
@@ -175,6 +216,26 @@ async def delete_category(
             status_code=403, detail="Not authorized to delete this category"
         )
 
+    # Uncategorize the todos with one UPDATE (rather than letting the ORM
+    # null the foreign keys row by row) and move them to the "no category"
+    # counters.
+    orphaned = session.execute(
+        update(Todo)
+        .where(Todo.category_id == category_id)
+        .values(category_id=None)
+        .returning(Todo.username, Todo.created_at, Todo.completed)
+    ).all()
+    by_username = defaultdict(list)
+    for username, created_at, completed in orphaned:
+        by_username[username].append((created_at, bool(completed)))
+    for username, todos in by_username.items():
+        count_todos(session, username, [(category_id, *todo) for todo in todos], -1)
+        count_todos(session, username, [(None, *todo) for todo in todos])
+        # Their category_id changed, so cached todo listings are stale too.
+        mark_changed(session, username, "todo")
+
     session.delete(category)
+    record_deletions(session, current_user.username, "category", [category_id])
+    mark_changed(session, current_user.username, "category")
     session.commit()
     return {"message": "Category deleted successfully"}
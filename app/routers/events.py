@@ -0,0 +1,79 @@
+"""
+Events router module.
+
+This module serves ``GET /events``, a Server-Sent Events stream that tells
+the current user's clients when their todos or categories change, so they
+can refetch (or call ``/sync``) instead of polling the list endpoints.
+
+Events are ``change`` (with the kinds of data that changed) and ``resync``
+(the client fell behind and should reload everything). A comment line is
+sent periodically to keep idle connections open through proxies.
+"""
+
+# Standard library imports
+import asyncio
+import json
+from typing import AsyncIterator
+
+# Third-party imports
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+
+# Local imports
+from app.core.config import EVENTS_KEEPALIVE_SECONDS
+from app.core.events import event_broker
+from app.core.security import get_current_active_user
+from app.models import User
+
+router = APIRouter()
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+def format_event(event: dict) -> bytes:
+    """Encode an event in the Server-Sent Events wire format."""
+    data = {key: value for key, value in event.items() if key != "type"}
+    return f"event: {event['type']}\ndata: {json.dumps(data)}\n\n".encode()
+
+
+async def _event_stream(request: Request, username: str) -> AsyncIterator[bytes]:
+    # Subscribe only once streaming starts, so the subscription is always
+    # released by the finally block below.
+    subscription = event_broker.subscribe(username)
+    try:
+        yield b"retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.get(), EVENTS_KEEPALIVE_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    return
+                yield b": keep-alive\n\n"
+                continue
+            yield format_event(event)
+    finally:
+        event_broker.unsubscribe(subscription)
+
+
+@router.get("/events", tags=["events"], response_class=StreamingResponse)
+async def events(
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
+) -> StreamingResponse:
+    """
+    Stream change notifications for the current user.
+
+    Args:
+        request: The incoming request, used to detect disconnects
+        current_user: The authenticated user making the request
+
+    Returns:
+        StreamingResponse: The Server-Sent Events stream
+    """
+    return StreamingResponse(
+        _event_stream(request, current_user.username),
+        media_type=SSE_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
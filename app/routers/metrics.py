@@ -0,0 +1,28 @@
+"""
+Metrics router module.
+
+Exposes the in-process metrics registry in the Prometheus text format so it
+can be scraped without authentication from inside the deployment network.
+"""
+
+# Third-party imports
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+# Local imports
+from app.core import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse, tags=["metrics"])
+async def get_metrics() -> PlainTextResponse:
+    """
+    Render all registered metrics.
+
+    Returns:
+        PlainTextResponse: The metrics in the Prometheus text exposition format
+    """
+    return PlainTextResponse(
+        metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,48 @@
+"""
+Stats router module.
+
+This module serves ``GET /stats``: the current user's todo totals, completed
+counts per category and a per-day histogram of the todos they created. By
+default it reads the materialized counters maintained on every todo write;
+``source=query`` computes the same numbers with GROUP BY over the todos.
+"""
+
+# Standard library imports
+from typing import Literal, Optional
+
+# Third-party imports
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+
+# Local imports
+from app.core.config import STATS_SOURCE
+from app.core.security import get_current_active_user
+from app.core.stats import compute_stats, read_stats
+from app.db.routing import get_read_db
+from app.models import TodoStats, User
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=TodoStats, tags=["stats"])
+def get_stats(
+    source: Optional[Literal["counters", "query"]] = Query(
+        None, description="Read materialized counters or aggregate the todos"
+    ),
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_read_db),
+) -> TodoStats:
+    """
+    Return the current user's todo statistics.
+
+    Args:
+        source: Where to compute the statistics from (defaults to STATS_SOURCE)
+        current_user: The authenticated user making the request
+        session: The database session
+
+    Returns:
+        TodoStats: Totals, per-category counts and the per-day histogram
+    """
+    if (source or STATS_SOURCE) == "query":
+        return compute_stats(session, current_user.username)
+    return read_stats(session, current_user.username)
@@ -3,8 +3,9 @@ Todo router module.
 
 This module handles all todo-related operations including:
 - Listing todos (with and without categories)
-- Creating new todos
-- Updating existing todos
+- Searching todo content
+- Creating new todos (one at a time or in bulk)
+- Updating existing todos (one at a time or in bulk)
 - Deleting todos
 
 All operations require user authentication and ensure that users can only
@@ -12,95 +13,307 @@ access and modify their own todos.
 """
 
 # Standard library imports
-from datetime import datetime
-from typing import List
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import List, Optional
 from uuid import UUID
 
 # Third-party imports
+from sqlalchemy import delete, insert, update
 from sqlmodel import Session, select
-from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
 
 # Local imports
+from app.core.config import DEFAULT_PAGE_SIZE, MAX_BULK_ITEMS, MAX_PAGE_SIZE
+from app.core.pagination import paginate
+from app.core.changes import mark_changed, record_deletions
+from app.core.response_cache import cached_listing, response_cache
+from app.core.search import search_todos
+from app.core.serialization import dumps, project, rows_json
+from app.core.stats import count_todos, todo_key
 from app.core.security import get_current_active_user
 from app.db.database import get_db
+from app.db.routing import get_read_db
 from app.models import (
+    BulkTodoResult,
+    BulkUpdateTodo,
     Todo,
     UpdateTodo,
     User,
     Category,
     CategoryWithTodos,
+    utcnow,
 )
 
 router = APIRouter()
 
+# Upper bound on the bound parameters of one IN (...) list.
+DELETE_CHUNK_SIZE = 500
+
+
+@dataclass
+class TodoFilters:
+    """The optional filters of the todo listing, injected with ``Depends()``."""
+
+    completed: Optional[bool] = Query(None, description="Filter by completion")
+    category_id: Optional[str] = Query(None, description="Filter by category")
+    created_from: Optional[date] = Query(
+        None, description="Only todos created on or after this date"
+    )
+    created_to: Optional[date] = Query(
+        None, description="Only todos created on or before this date"
+    )
+
+    def apply(self, statement):
+        """Restrict a select of todos to the ones matching the filters."""
+        if self.completed is not None:
+            statement = statement.where(Todo.completed == self.completed)
+        if self.category_id is not None:
+            statement = statement.where(Todo.category_id == self.category_id)
+        if self.created_from is not None:
+            statement = statement.where(Todo.created_at >= self.created_from)
+        if self.created_to is not None:
+            statement = statement.where(Todo.created_at <= self.created_to)
+        return statement
+
+
+def _prepare_new_todo(todo: Todo, username: str) -> None:
+    """
+    Assign ownership, stamp updated_at and normalize the id and date of a
+    todo to be created.
+
+    Raises:
+        HTTPException: If the date format is invalid
+    """
+    todo.username = username
+    todo.updated_at = utcnow()
+
+    todo.id = str(UUID(todo.id)) if isinstance(todo.id, UUID) else str(todo.id)
+
+    if isinstance(todo.created_at, str):
+        try:
+            todo.created_at = datetime.strptime(todo.created_at, "%Y-%m-%d").date()
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
+            ) from exc
+
+
+def _update_values(updated_todo: UpdateTodo) -> dict:
+    """Return the column values an update request actually changes."""
+    values = {}
+    if updated_todo.content:
+        values["content"] = updated_todo.content
+    if updated_todo.completed is not None:
+        values["completed"] = updated_todo.completed
+    if updated_todo.category_id:
+        values["category_id"] = updated_todo.category_id
+    return values
+
+
+def _delete_returning(session: Session, *conditions) -> List[Todo]:
+    """
+    Delete the matching todos with one statement and return what was deleted.
+
+    The deleted rows come back through RETURNING as plain columns and are
+    rebuilt as new Todo objects, so they stay readable after the commit.
+    """
+    rows = session.execute(
+        delete(Todo).where(*conditions).returning(*Todo.__table__.columns)
+    ).mappings()
+    return [Todo(**row) for row in rows]
+
+
+def _check_bulk_size(items: list) -> None:
+    if not items:
+        raise HTTPException(status_code=422, detail="No todos provided.")
+    if len(items) > MAX_BULK_ITEMS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Too many todos in one request (maximum {MAX_BULK_ITEMS}).",
+        )
+
+
+def categories_with_todos_json(
+    session: Session, username: str, todo_projection: Optional[tuple] = None
+) -> bytes:
+    """
+    Encode every category of ``username`` with its todos as JSON.
+
+    Loads the categories and all of the user's categorized todos in two
+    statements, as plain rows, instead of one todo query per category.
+
+    Args:
+        session: The database session
+        username: The owner of the categories
+        todo_projection: The todo columns and field names from ``project``
+            (which must select ``category_id``), every field if None
+
+    Returns:
+        bytes: The JSON array of categories
+    """
+    columns, names = todo_projection or project(Todo, None)
+    categories = session.execute(
+        select(
+            Category.id, Category.name, Category.created_at, Category.username
+        ).where(Category.username == username)
+    ).all()
+    todos_by_category = defaultdict(list)
+    if categories:
+        rows = session.execute(
+            select(*columns).where(
+                Todo.username == username,
+                Todo.category_id.is_not(None),  # pylint: disable=no-member
+            )
+        )
+        for row in rows:
+            todos_by_category[row.category_id].append(dict(zip(names, row)))
+
+    return dumps(
+        [
+            {
+                "id": category.id,
+                "name": category.name,
+                "created_at": category.created_at,
+                "username": category.username,
+                "todos": todos_by_category.get(category.id, []),
+            }
+            for category in categories
+        ]
+    )
+
 
 @router.get(
     "/categories_with_todos",
     response_model=List[CategoryWithTodos],
     tags=["categories"],
 )
-async def get_categories_with_todos(
+def get_categories_with_todos(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. id,content"
+    ),
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
 ) -> List[CategoryWithTodos]:
     """
     Retrieve all categories with their associated todos for the current user.
 
+    Responses carry a weak ETag and are served from the per-user response
+    cache when possible; a matching If-None-Match gets 304 Not Modified.
+    Only the requested todo ``fields`` are selected and returned when given.
+
     Args:
+        request: The incoming request, used for the cache key
+        response: The outgoing response, used for the ETag header
+        fields: Comma-separated todo fields to return, all of them if omitted
         current_user: The authenticated user making the request
         session: The database session
 
     Returns:
         List[CategoryWithTodos]: A list of categories, each containing its todos
     """
-    categories = session.exec(
-        select(Category).where(Category.username == current_user.username)
-    ).all()
+    todo_projection = project(Todo, fields, required=("category_id",))
+    cached, cache_key = cached_listing(
+        request, response, session, current_user.username, ("category", "todo")
+    )
+    if cached is not None:
+        return cached
 
-    result = []
-    for category in categories:
-        todos = session.exec(
-            select(Todo).where(
-                Todo.category_id == category.id, Todo.username == current_user.username
-            )
-        ).all()
+    body = categories_with_todos_json(session, current_user.username, todo_projection)
+    return response_cache.put(cache_key, body, response.headers)
 
-        result.append(
-            CategoryWithTodos(
-                id=category.id,
-                name=category.name,
-                created_at=category.created_at,
-                username=category.username,
-                todos=todos,
-            )
-        )
 
-    return result
+@router.get("/todos", response_model=List[Todo], tags=["todos"])
+# Each parameter is injected by FastAPI; the filters are grouped already.
+def get_todos(  # pylint: disable=too-many-arguments
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = Query(
+        None, description="Cursor from the X-Next-Cursor header of the last page"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum page size"),
+    filters: TodoFilters = Depends(),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return, e.g. id,content"
+    ),
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_read_db),
+) -> List[Todo]:
+    """
+    Retrieve one page of todos for the current user.
+
+    Todos are ordered by creation date. When more todos remain, the cursor of
+    the next page is returned in the X-Next-Cursor response header. Responses
+    carry a weak ETag and are served from the per-user response cache when
+    possible; a matching If-None-Match gets 304 Not Modified. Only the
+    requested ``fields`` are selected and returned when given.
 
+    Args:
+        request: The incoming request, used for the cache key
+        response: The outgoing response, used for the cursor and ETag headers
+        cursor: The cursor of the page to fetch, omitted for the first page
+        limit: The maximum number of todos to return (capped server-side)
+        filters: Only return todos matching these filters
+        fields: Comma-separated fields to return, all of them if omitted
+        current_user: The authenticated user making the request
+        session: The database session
 
-@router.get("/todos", response_model=List[Todo], tags=["todos"])
-async def get_todos(
+    Returns:
+        List[Todo]: A page of todos belonging to the current user
+    """
+    columns, names = project(Todo, fields, required=("created_at", "id"))
+    cached, cache_key = cached_listing(
+        request, response, session, current_user.username, ("todo",)
+    )
+    if cached is not None:
+        return cached
+
+    statement = filters.apply(
+        select(*columns).where(Todo.username == current_user.username)
+    )
+    rows = paginate(session, statement, Todo, response, cursor, limit)
+    return response_cache.put(cache_key, rows_json(rows, names), response.headers)
+
+
+@router.get("/todos/search", response_model=List[Todo], tags=["todos"])
+def search_todos_endpoint(
+    q: str = Query(..., min_length=1, description="Words to search for"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, description="Maximum page size"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_db),
+    session: Session = Depends(get_read_db),
 ) -> List[Todo]:
     """
-    Retrieve all todos for the current user.
+    Search the current user's todos by content.
+
+    Every word must appear in the todo (the last one may be a prefix), and
+    results are ranked by relevance.
 
     Args:
+        q: The words to search for
+        limit: The maximum number of todos to return (capped server-side)
+        offset: The number of results to skip, for the following pages
         current_user: The authenticated user making the request
         session: The database session
 
     Returns:
-        List[Todo]: A list of all todos belonging to the current user
+        List[Todo]: One page of matching todos, best match first
+
+    Raises:
+        HTTPException: If the query has no words
     """
-    todos = session.exec(
-        select(Todo).where(Todo.username == current_user.username)
-    ).all()
-    return todos
+    if not q.split():
+        raise HTTPException(status_code=422, detail="Search query is empty.")
+    return search_todos(
+        session, current_user.username, q, min(limit, MAX_PAGE_SIZE), offset
+    )
 
 
 @router.post("/todos", response_model=Todo, tags=["todos"], status_code=201)
-async def add_todo(
+def add_todo(
     todo: Todo,
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_db),
@@ -119,26 +332,18 @@ async def add_todo(
     Raises:
         HTTPException: If the date format is invalid
     """
-    todo.username = current_user.username
-
-    todo.id = str(UUID(todo.id)) if isinstance(todo.id, UUID) else str(todo.id)
-
-    if isinstance(todo.created_at, str):
-        try:
-            todo.created_at = datetime.strptime(todo.created_at, "%Y-%m-%d").date()
-        except ValueError as exc:
-            raise HTTPException(
-                status_code=400, detail="Invalid date format. Use YYYY-MM-DD."
-            ) from exc
+    _prepare_new_todo(todo, current_user.username)
 
     session.add(todo)
+    count_todos(session, current_user.username, [todo_key(todo)])
+    mark_changed(session, current_user.username, "todo")
     session.commit()
     session.refresh(todo)
     return todo
 
 
 @router.put("/todos/{todo_id}", response_model=Todo, tags=["todos"])
-async def update_todo(
+def update_todo(
     todo_id: str,
     updated_todo: UpdateTodo,
     current_user: User = Depends(get_current_active_user),
@@ -171,28 +376,201 @@ async def update_todo(
             status_code=403,
             detail=f"You don't have permission to update todo with id {todo_id}",
         )
-    if updated_todo.content:
-        todo.content = updated_todo.content
-    if updated_todo.completed is not None:
-        todo.completed = updated_todo.completed
-    if updated_todo.category_id:
-        todo.category_id = updated_todo.category_id
+    count_todos(session, current_user.username, [todo_key(todo)], sign=-1)
+    for field, value in _update_values(updated_todo).items():
+        setattr(todo, field, value)
+    count_todos(session, current_user.username, [todo_key(todo)])
+    mark_changed(session, current_user.username, "todo")
     session.commit()
     session.refresh(todo)
     return todo
 
 
+@router.post("/todos/bulk", response_model=List[BulkTodoResult], tags=["todos"])
+def add_todos_bulk(
+    todos: List[Todo],
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_db),
+) -> List[BulkTodoResult]:
+    """
+    Create many todos for the current user in a single transaction.
+
+    Valid items are written with one multi-row INSERT; invalid items are
+    skipped and reported without affecting the rest of the batch.
+
+    Args:
+        todos: The todo items to create
+        current_user: The authenticated user making the request
+        session: The database session
+
+    Returns:
+        List[BulkTodoResult]: One result per item, in request order
+
+    Raises:
+        HTTPException: If the list is empty or larger than MAX_BULK_ITEMS
+    """
+    _check_bulk_size(todos)
+
+    # pylint: disable=no-member
+    existing_ids = set(
+        session.exec(
+            select(Todo.id).where(Todo.id.in_([str(todo.id) for todo in todos]))
+        ).all()
+    )
+    # pylint: enable=no-member
+
+    results = []
+    rows = []
+    keys = []
+    for todo in todos:
+        try:
+            _prepare_new_todo(todo, current_user.username)
+        except HTTPException as exc:
+            results.append(
+                BulkTodoResult(
+                    id=str(todo.id), status=exc.status_code, detail=exc.detail
+                )
+            )
+            continue
+
+        if todo.id in existing_ids:
+            results.append(
+                BulkTodoResult(
+                    id=todo.id,
+                    status=409,
+                    detail=f"Todo with id {todo.id} already exists.",
+                )
+            )
+            continue
+
+        existing_ids.add(todo.id)
+        rows.append(todo.model_dump())
+        keys.append(todo_key(todo))
+        results.append(BulkTodoResult(id=todo.id, status=201))
+
+    if rows:
+        session.execute(insert(Todo), rows)
+        count_todos(session, current_user.username, keys)
+        mark_changed(session, current_user.username, "todo")
+        session.commit()
+    return results
+
+
+@router.patch("/todos/bulk", response_model=List[BulkTodoResult], tags=["todos"])
+def update_todos_bulk(
+    updates: List[BulkUpdateTodo],
+    current_user: User = Depends(get_current_active_user),
+    session: Session = Depends(get_db),
+) -> List[BulkTodoResult]:
+    """
+    Update many todos in a single transaction.
+
+    Ownership is checked for every item with one query; the permitted updates
+    are then applied as executemany UPDATEs by primary key. Items that are
+    missing or belong to another user are reported and skipped.
+
+    Args:
+        updates: The todo ids and the fields to change for each
+        current_user: The authenticated user making the request
+        session: The database session
+
+    Returns:
+        List[BulkTodoResult]: One result per item, in request order
+
+    Raises:
+        HTTPException: If the list is empty or larger than MAX_BULK_ITEMS
+    """
+    _check_bulk_size(updates)
+
+    # pylint: disable=no-member
+    current = {
+        row.id: row
+        for row in session.exec(
+            select(
+                Todo.id,
+                Todo.username,
+                Todo.category_id,
+                Todo.created_at,
+                Todo.completed,
+            ).where(Todo.id.in_([item.id for item in updates]))
+        ).all()
+    }
+    # pylint: enable=no-member
+
+    results = []
+    rows = []
+    keys = {}
+    for item in updates:
+        row = current.get(item.id)
+        if row is None:
+            results.append(
+                BulkTodoResult(
+                    id=item.id,
+                    status=404,
+                    detail=f"Todo with id {item.id} not found.",
+                )
+            )
+            continue
+        if row.username != current_user.username:
+            results.append(
+                BulkTodoResult(
+                    id=item.id,
+                    status=403,
+                    detail=(
+                        "You don't have permission to update todo " f"with id {item.id}"
+                    ),
+                )
+            )
+            continue
+
+        values = _update_values(item)
+        if values:
+            rows.append({"id": item.id, **values})
+            old_key, (category_id, created_at, done) = keys.get(
+                item.id, (todo_key(row), todo_key(row))
+            )
+            new_key = (
+                values.get("category_id", category_id),
+                created_at,
+                values.get("completed", done),
+            )
+            keys[item.id] = (old_key, new_key)
+        results.append(BulkTodoResult(id=item.id, status=200))
+
+    if rows:
+        session.execute(update(Todo), rows)
+        count_todos(
+            session, current_user.username, [old for old, _ in keys.values()], sign=-1
+        )
+        count_todos(session, current_user.username, [new for _, new in keys.values()])
+        mark_changed(session, current_user.username, "todo")
+        session.commit()
+    return results
+
+
 @router.delete("/todos", tags=["todos"], response_model=List[Todo])
-async def delete_todos(
-    ids: str = Query(..., description="Comma-separated list of todo IDs"),
+def delete_todos(
+    ids: Optional[str] = Query(None, description="Comma-separated list of todo IDs"),
+    completed: Optional[bool] = Query(
+        None,
+        description=(
+            "Delete the todos with this completion state; without ids, purges "
+            "every matching todo of the current user"
+        ),
+    ),
     current_user: User = Depends(get_current_active_user),
     session: Session = Depends(get_db),
 ) -> List[Todo]:
     """
-    Delete multiple todos by their IDs.
+    Delete multiple todos by their IDs, by completion state, or both.
+
+    Deletes are set-based: each statement is a single
+    ``DELETE ... WHERE id IN (...) AND username = ? RETURNING *`` (chunked for
+    very long ID lists) instead of loading and deleting todos one by one.
 
     Args:
         ids: Comma-separated list of todo IDs to delete
+        completed: Only delete todos with this completion state
         current_user: The authenticated user making the request
         session: The database session
 
@@ -200,9 +578,32 @@ async def delete_todos(
         List[Todo]: The list of deleted todos
 
     Raises:
-        HTTPException: If no valid IDs provided, todos not found, or user doesn't have permission
+        HTTPException: If no valid IDs or predicate provided, todos not found,
+            or user doesn't have permission
     """
-    id_list = [todo_id.strip() for todo_id in ids.split(",") if todo_id.strip()]
+    # pylint: disable=no-member
+    conditions = [Todo.username == current_user.username]
+    if completed is not None:
+        conditions.append(Todo.completed == completed)
+
+    if ids is None:
+        if completed is None:
+            raise HTTPException(
+                status_code=422,
+                detail="Provide a comma-separated list of IDs or a completed filter.",
+            )
+        deleted = _delete_returning(session, *conditions)
+        count_todos(session, current_user.username, map(todo_key, deleted), sign=-1)
+        record_deletions(
+            session, current_user.username, "todo", [todo.id for todo in deleted]
+        )
+        mark_changed(session, current_user.username, "todo")
+        session.commit()
+        return deleted
+
+    id_list = list(
+        dict.fromkeys(todo_id.strip() for todo_id in ids.split(",") if todo_id.strip())
+    )
 
     if not id_list:
         raise HTTPException(
@@ -210,22 +611,42 @@ async def delete_todos(
             detail="No valid IDs provided. Please provide a comma-separated list of IDs.",
         )
 
-    # pylint: disable=no-member
-    todos_to_delete = session.exec(select(Todo).where(Todo.id.in_(id_list))).all()
+    deleted = []
+    for start in range(0, len(id_list), DELETE_CHUNK_SIZE):
+        chunk = id_list[start : start + DELETE_CHUNK_SIZE]
+        deleted.extend(_delete_returning(session, Todo.id.in_(chunk), *conditions))
+
+    if len(deleted) < len(id_list):
+        # Some IDs were not deleted: either they don't exist or they belong to
+        # someone else. The latter aborts the whole request, as before.
+        deleted_ids = {todo.id for todo in deleted}
+        missing = [todo_id for todo_id in id_list if todo_id not in deleted_ids]
+        for start in range(0, len(missing), DELETE_CHUNK_SIZE):
+            foreign_id = session.exec(
+                select(Todo.id)
+                .where(
+                    Todo.id.in_(missing[start : start + DELETE_CHUNK_SIZE]),
+                    Todo.username != current_user.username,
+                )
+                .limit(1)
+            ).first()
+            if foreign_id is not None:
+                session.rollback()
+                raise HTTPException(
+                    status_code=403,
+                    detail=f"You don't have permission to delete todo with id {foreign_id}",
+                )
     # pylint: enable=no-member
 
-    if not todos_to_delete:
+    if not deleted:
         raise HTTPException(
             status_code=404, detail=f"No Todos found for the provided IDs: {id_list}"
         )
 
-    for todo in todos_to_delete:
-        if todo.username != current_user.username:
-            raise HTTPException(
-                status_code=403,
-                detail=f"You don't have permission to delete todo with id {todo.id}",
-            )
-        session.delete(todo)
-
+    count_todos(session, current_user.username, map(todo_key, deleted), sign=-1)
+    record_deletions(
+        session, current_user.username, "todo", [todo.id for todo in deleted]
+    )
+    mark_changed(session, current_user.username, "todo")
     session.commit()
-    return todos_to_delete
+    return deleted
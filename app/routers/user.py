@@ -17,6 +17,7 @@ from typing import Annotated
 # Third-party imports
 from sqlmodel import Session
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
 
 # Local imports
@@ -68,7 +69,7 @@ async def login_for_access_token(
     Raises:
         HTTPException: If authentication fails
     """
-    user = authenticate_user(session, form_data.username, form_data.password)
+    user = await authenticate_user(session, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -98,7 +99,7 @@ async def create_new_user(user: UserCreate, session: Session = Depends(get_db))
         HTTPException: If registration fails (e.g., username already exists)
     """
     try:
-        new_user = create_user(db=session, user=user)
+        new_user = await create_user(db=session, user=user)
         return new_user
     except HTTPException as exc:
         raise exc
@@ -123,15 +124,21 @@ async def verify_token_endpoint(token: str = Depends(oauth2_scheme)) -> bool:
 
 
 @router.post("/logout", tags=["users"])
-async def logout(token: str = Depends(oauth2_scheme)) -> dict:
+async def logout(
+    token: str = Depends(oauth2_scheme), session: Session = Depends(get_db)
+) -> dict:
     """
     Revoke a user's access token (logout).
 
+    The token is rejected by this worker immediately and by every other
+    worker within ``REVOCATION_SYNC_SECONDS``.
+
     Args:
         token: The JWT token to revoke
+        session: The database session
 
     Returns:
         dict: A message confirming successful logout
     """
-    revoke_token(token)
+    await run_in_threadpool(revoke_token, session, token)
     return {"message": "Logout successful"}
@@ -0,0 +1,118 @@
+"""
+Production server entry point.
+
+Runs the API in ``WEB_CONCURRENCY`` worker processes (one per CPU by
+default) without the reloader:
+
+- under gunicorn with uvicorn workers when gunicorn is installed, with the
+  app preloaded in the master so workers fork with it already imported;
+- otherwise under uvicorn's own process manager, which starts each worker
+  by importing the app afresh.
+
+uvloop and httptools are used when they are installed. Keep-alive, listen
+backlog and the graceful shutdown timeout come from ``app.core.config``.
+
+Forked workers must not reuse the master's pooled database connections;
+``app.db.database`` drops them in every child process (see
+``dispose_engines``), so SQLite connections are never shared across forks.
+
+Usage:
+    python -m app.server
+"""
+
+# Standard library imports
+import importlib.util
+import logging
+
+# Third-party imports
+import uvicorn
+
+# Local imports
+from app.core.config import (
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    SERVER_HOST,
+    SERVER_KEEPALIVE_SECONDS,
+    SERVER_PORT,
+    WEB_CONCURRENCY,
+)
+
+APP = "app.main:app"
+
+logger = logging.getLogger(__name__)
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def uvicorn_options() -> dict:
+    """Return the ``uvicorn.run`` arguments for the production server."""
+    return {
+        "host": SERVER_HOST,
+        "port": SERVER_PORT,
+        "workers": WEB_CONCURRENCY,
+        "loop": "uvloop" if _installed("uvloop") else "asyncio",
+        "http": "httptools" if _installed("httptools") else "h11",
+        "backlog": SERVER_BACKLOG,
+        "timeout_keep_alive": SERVER_KEEPALIVE_SECONDS,
+        "timeout_graceful_shutdown": SERVER_GRACEFUL_TIMEOUT_SECONDS,
+        "proxy_headers": True,
+    }
+
+
+def gunicorn_options() -> dict:
+    """Return the gunicorn settings for the production server."""
+    return {
+        "bind": f"{SERVER_HOST}:{SERVER_PORT}",
+        "workers": WEB_CONCURRENCY,
+        # Picks uvloop and httptools by itself when they are installed.
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "backlog": SERVER_BACKLOG,
+        "keepalive": SERVER_KEEPALIVE_SECONDS,
+        "graceful_timeout": SERVER_GRACEFUL_TIMEOUT_SECONDS,
+    }
+
+
+def run_gunicorn() -> None:
+    """Serve the app under gunicorn with uvicorn workers."""
+    # pylint: disable=import-outside-toplevel,import-error,abstract-method
+    from gunicorn.app.base import BaseApplication
+
+    class Server(BaseApplication):
+        """gunicorn application configured from ``gunicorn_options``."""
+
+        def load_config(self):
+            """Apply the production settings to gunicorn's config."""
+            for key, value in gunicorn_options().items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            """Import the app once, in the master, before workers fork."""
+            from app.main import app
+
+            return app
+
+    Server().run()
+
+
+def main() -> None:
+    """Start the production server, preferring gunicorn when installed."""
+    if _installed("gunicorn"):
+        logger.info("Starting gunicorn with %d workers", WEB_CONCURRENCY)
+        run_gunicorn()
+    else:
+        options = uvicorn_options()
+        logger.info(
+            "Starting uvicorn with %d workers (%s, %s)",
+            options["workers"],
+            options["loop"],
+            options["http"],
+        )
+        uvicorn.run(APP, **options)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
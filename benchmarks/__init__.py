@@ -0,0 +1,7 @@
+"""
+Benchmarks for the Todo List API.
+
+Each module in this package is a standalone script that can be run with
+``python -m benchmarks.<name>`` from the project root. Benchmarks use their
+own temporary database and never touch ``database.db``.
+"""
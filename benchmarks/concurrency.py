@@ -0,0 +1,163 @@
+"""
+Concurrency benchmark.
+
+Drives ``GET /todos`` with many parallel clients against the in-process ASGI
+app and reports latency percentiles. Every SQL statement is delayed by
+``--query-delay-ms`` to stand in for a slow disk or a slow query, which makes
+handlers that block the event loop show up as a long latency tail.
+
+The workload runs twice: once with the handlers and their dependencies run
+on the event loop, as the former ``async def`` handlers did, and once in the
+bounded worker thread pool they use now.
+
+Usage:
+    python -m benchmarks.concurrency --clients 200 --requests 5
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import date
+from pathlib import Path
+
+# Third-party imports
+import fastapi.dependencies.utils
+import fastapi.routing
+import httpx
+from anyio import to_thread
+from sqlalchemy import event
+from sqlmodel import Session
+
+# Local imports
+from app.core.config import DB_THREADPOOL_SIZE
+from app.core.response_cache import response_cache
+from app.core.security import create_access_token
+from app.core.token_cache import token_cache
+from app.db.database import create_db_engine, get_db, get_replica_db
+from app.db.migrations import migrate
+from app.main import app
+from app.models import Todo, User
+
+
+def percentile(samples: list, pct: float) -> float:
+    """Return the ``pct`` percentile of ``samples`` (nearest-rank)."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def build_engine(database: Path, query_delay: float):
+    """Create a seeded SQLite engine that sleeps before every statement."""
+    engine = create_db_engine(f"sqlite:///{database}")
+    migrate(engine)
+
+    with Session(engine) as session:
+        session.add(
+            User(username="bench", name="Bench", hashed_password="x", disabled=False)
+        )
+        for index in range(50):
+            session.add(
+                Todo(
+                    username="bench",
+                    content=f"Todo {index}",
+                    created_at=date.today(),
+                )
+            )
+        session.commit()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _delay(*_):
+        time.sleep(query_delay)
+
+    return engine
+
+
+@contextmanager
+def handlers_on_event_loop():
+    """Run sync handlers and dependencies inline instead of in the thread pool."""
+
+    async def run_inline(func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    modules = (fastapi.routing, fastapi.dependencies.utils)
+    saved = [module.run_in_threadpool for module in modules]
+    for module in modules:
+        module.run_in_threadpool = run_inline
+    try:
+        yield
+    finally:
+        for module, original in zip(modules, saved):
+            module.run_in_threadpool = original
+
+
+async def run(clients: int, requests_per_client: int, query_delay_ms: float) -> dict:
+    """Run the benchmark and return a summary of the measured latencies."""
+    # Each run starts cold, so that profiles are compared on the same work.
+    response_cache.clear()
+    token_cache.clear()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = build_engine(Path(tmp) / "bench.db", query_delay_ms / 1000)
+
+        def get_bench_db():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_db] = get_bench_db
+        app.dependency_overrides[get_replica_db] = get_bench_db
+        to_thread.current_default_thread_limiter().total_tokens = DB_THREADPOOL_SIZE
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': 'bench'})}"}
+        latencies = []
+
+        async def client_loop(client: httpx.AsyncClient):
+            for _ in range(requests_per_client):
+                started = time.perf_counter()
+                response = await client.get("/todos", headers=headers)
+                latencies.append(time.perf_counter() - started)
+                response.raise_for_status()
+
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                started = time.perf_counter()
+                await asyncio.gather(*(client_loop(client) for _ in range(clients)))
+                elapsed = time.perf_counter() - started
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.mean(latencies) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5)
+    parser.add_argument("--query-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    profiles = {"event loop": handlers_on_event_loop, "thread pool": nullcontext}
+    for name, profile in profiles.items():
+        with profile():
+            summary = asyncio.run(run(args.clients, args.requests, args.query_delay_ms))
+        print(
+            f"{name:>11}: {summary['rps']:7,.1f} req/s  "
+            f"p50 {summary['p50_ms']:8.2f} ms  p95 {summary['p95_ms']:8.2f} ms  "
+            f"p99 {summary['p99_ms']:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+HTTP API load benchmark.
+
+Seeds a temporary database with realistic volumes (many users, each with
+categories and todos), then drives the in-process ASGI app with concurrent
+clients, one scenario at a time:
+
+- ``token``: ``POST /token`` (password verification)
+- ``todos``: ``GET /todos`` (first page)
+- ``categories_with_todos``: ``GET /categories_with_todos``
+- ``bulk_delete``: ``DELETE /todos?ids=...`` with ``--delete-batch`` ids
+
+For each scenario it reports throughput and p50/p95/p99 latency, and writes
+every result with the commit and machine details to a JSON file under
+``benchmarks/results/``. Pass ``--compare`` with an earlier file to print
+the change per scenario; only compare runs made on the same machine.
+
+Usage:
+    python -m benchmarks.http_api --users 20 --todos 2000 --clients 50
+    python -m benchmarks.http_api --compare benchmarks/results/<earlier>.json
+"""
+
+# Standard library imports
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Third-party imports
+import httpx
+from anyio import to_thread
+from sqlalchemy import insert
+from sqlmodel import Session
+
+# Local imports
+from app.core.config import DB_THREADPOOL_SIZE
+from app.core.response_cache import MemoryBackend, response_cache
+from app.core.security import create_access_token, get_password_hash
+from app.core.stats import backfill_counters
+from app.db.database import create_db_engine, get_db, get_replica_db
+from app.db.migrations import migrate
+from app.main import app
+from app.models import Category, Todo, User
+from benchmarks.concurrency import percentile
+
+RESULTS_DIR = Path(__file__).parent / "results"
+PASSWORD = "bench-password"
+SCENARIOS = ("token", "todos", "categories_with_todos", "bulk_delete")
+
+
+def seed(engine, users: int, todos: int, categories: int, disposable: int) -> dict:
+    """
+    Fill the database and return the ids the scenarios need.
+
+    Every user gets ``categories`` categories and ``todos`` todos spread over
+    them and over the last year, plus ``disposable`` extra todos reserved for
+    the delete scenario.
+    """
+    hashed_password = get_password_hash(PASSWORD)
+    rng = random.Random(42)
+    today = date.today()
+    disposable_ids: Dict[str, List[str]] = {}
+
+    with Session(engine) as session:
+        for user_index in range(users):
+            username = f"bench{user_index}"
+            session.add(
+                User(
+                    username=username,
+                    name=f"Bench {user_index}",
+                    hashed_password=hashed_password,
+                    disabled=False,
+                )
+            )
+            category_ids = [f"{username}-c{index}" for index in range(categories)]
+            session.execute(
+                insert(Category),
+                [
+                    {
+                        "id": category_id,
+                        "name": f"Category {index}",
+                        "created_at": today,
+                        "username": username,
+                    }
+                    for index, category_id in enumerate(category_ids)
+                ],
+            )
+            rows = [
+                {
+                    "id": f"{username}-t{index}",
+                    "username": username,
+                    "content": f"Todo {index} for {username}",
+                    "completed": rng.random() < 0.3,
+                    "created_at": today - timedelta(days=rng.randrange(365)),
+                    "category_id": rng.choice(category_ids + [None]),
+                }
+                for index in range(todos + disposable)
+            ]
+            session.execute(insert(Todo), rows)
+            disposable_ids[username] = [row["id"] for row in rows[todos:]]
+        backfill_counters(session.connection())
+        session.commit()
+
+    return {"usernames": list(disposable_ids), "disposable": disposable_ids}
+
+
+def build_requests(seeded: dict, delete_batch: int) -> Dict[str, Callable]:
+    """Return, per scenario, a function that builds the next request."""
+    usernames = seeded["usernames"]
+    headers = {
+        username: {"Authorization": f"Bearer {create_access_token({'sub': username})}"}
+        for username in usernames
+    }
+    next_user = itertools.cycle(usernames).__next__
+    disposable = {
+        username: iter(
+            [
+                ids[start : start + delete_batch]
+                for start in range(0, len(ids), delete_batch)
+            ]
+        )
+        for username, ids in seeded["disposable"].items()
+    }
+
+    def token():
+        return (
+            "POST",
+            "/token",
+            {"data": {"username": next_user(), "password": PASSWORD}},
+        )
+
+    def todos():
+        return "GET", "/todos", {"headers": headers[next_user()]}
+
+    def categories_with_todos():
+        return "GET", "/categories_with_todos", {"headers": headers[next_user()]}
+
+    def bulk_delete():
+        username = next_user()
+        ids = next(disposable[username])
+        return (
+            "DELETE",
+            "/todos",
+            {"headers": headers[username], "params": {"ids": ",".join(ids)}},
+        )
+
+    return {
+        "token": token,
+        "todos": todos,
+        "categories_with_todos": categories_with_todos,
+        "bulk_delete": bulk_delete,
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient, make_request: Callable, clients: int, requests: int
+) -> dict:
+    """Send ``requests`` requests from ``clients`` concurrent clients."""
+    latencies = []
+    errors = 0
+    remaining = itertools.count()
+
+    async def client_loop():
+        nonlocal errors
+        while next(remaining) < requests:
+            method, url, kwargs = make_request()
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Seed a temporary database, run the scenarios and return the results."""
+    scenarios = args.scenarios or SCENARIOS
+    disposable = args.requests * args.delete_batch // args.users + args.delete_batch
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'bench.db'}")
+        migrate(engine)
+        seeded = seed(
+            engine,
+            args.users,
+            args.todos,
+            args.categories,
+            disposable if "bulk_delete" in scenarios else 0,
+        )
+        requests = build_requests(seeded, args.delete_batch)
+
+        def get_bench_db():
+            with Session(engine) as session:
+                yield session
+
+        app.dependency_overrides[get_db] = get_bench_db
+        app.dependency_overrides[get_replica_db] = get_bench_db
+        to_thread.current_default_thread_limiter().total_tokens = DB_THREADPOOL_SIZE
+        if args.no_response_cache:
+            response_cache.backend = MemoryBackend(max_bytes=0)
+
+        # Unhandled errors become 500 responses and are counted, not raised.
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        try:
+            async with httpx.AsyncClient(
+                transport=transport, base_url="http://bench"
+            ) as client:
+                for scenario in scenarios:
+                    results[scenario] = await run_scenario(
+                        client,
+                        requests[scenario],
+                        args.clients,
+                        args.token_requests if scenario == "token" else args.requests,
+                    )
+        finally:
+            app.dependency_overrides.clear()
+            engine.dispose()
+
+    return results
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def save_results(results: dict, args: argparse.Namespace) -> Path:
+    """Write the results and the run's context to a new JSON file."""
+    commit = _git_commit()
+    document = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "parameters": {
+            key: value for key, value in vars(args).items() if key != "compare"
+        },
+        "results": results,
+    }
+    RESULTS_DIR.mkdir(exist_ok=True)
+    path = RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    path.write_text(json.dumps(document, indent=2))
+    return path
+
+
+def print_results(results: dict, baseline: dict = None) -> None:
+    """Print one row per scenario, with the change from ``baseline`` if given."""
+    columns = ("rps", "p50_ms", "p95_ms", "p99_ms")
+    print(
+        f"{'scenario':<24}{'requests':>9}{'errors':>8}"
+        + "".join(f"{column:>18}" for column in columns)
+    )
+    for scenario, result in results.items():
+        cells = []
+        for column in columns:
+            cell = f"{result[column]:,.1f}"
+            if baseline and scenario in baseline:
+                before = baseline[scenario][column]
+                cell += (
+                    f" ({(result[column] - before) / before:+.0%})" if before else ""
+                )
+            cells.append(f"{cell:>18}")
+        print(
+            f"{scenario:<24}{result['requests']:>9}{result['errors']:>8}"
+            + "".join(cells)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--todos", type=int, default=2000, help="todos per user")
+    parser.add_argument("--categories", type=int, default=10, help="per user")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000, help="per scenario")
+    parser.add_argument(
+        "--token-requests",
+        type=int,
+        default=100,
+        help="requests for the token scenario (bcrypt makes each one slow)",
+    )
+    parser.add_argument("--delete-batch", type=int, default=50)
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS)
+    parser.add_argument(
+        "--no-response-cache",
+        action="store_true",
+        help="measure list endpoints without the response cache",
+    )
+    parser.add_argument("--compare", type=Path, help="earlier results file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    baseline = json.loads(args.compare.read_text())["results"] if args.compare else None
+    print_results(results, baseline)
+    print(f"\nResults written to {save_results(results, args)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+JSON serialization benchmark.
+
+Seeds one user with ``--todos`` todos spread over ``--categories``
+categories, then times building the JSON body of a full todo listing and of
+``/categories_with_todos`` along each path:
+
+- ``fastapi``: ORM instances validated through ``response_model`` and
+  encoded with the standard library, as a stock FastAPI route does
+- ``orm``: ORM instances dumped with a pydantic ``TypeAdapter`` (the path
+  the list endpoints used before row encoding)
+- ``rows``: plain rows from a column select, encoded with orjson
+- ``rows-stdlib``: the same rows with the standard library fallback
+- ``rows-fields``: rows of only the ``--fields`` todo columns, as requested
+  with the list endpoints' ``fields=`` parameter
+
+Each path includes its query. The median of ``--repeat`` runs is reported,
+with the body size and the peak memory allocated while building it.
+
+Usage:
+    python -m benchmarks.serialization --todos 10000
+"""
+
+# Standard library imports
+import argparse
+import json
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Third-party imports
+from pydantic import TypeAdapter
+from sqlalchemy import insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select
+
+# Local imports
+from app.core import serialization
+from app.core.serialization import project, rows_json
+from app.db.database import create_db_engine
+from app.db.migrations import migrate
+from app.models import Category, CategoryWithTodos, Todo
+from app.routers.todo import categories_with_todos_json
+
+USERNAME = "bench"
+
+_todo_list = TypeAdapter(List[Todo])
+_category_with_todos_list = TypeAdapter(List[CategoryWithTodos])
+_TODO_COLUMNS, _TODO_FIELDS = project(Todo, None)
+
+
+def seed(engine, todos: int, categories: int) -> None:
+    rng = random.Random(42)
+    today = date.today()
+    category_ids = [f"c{index}" for index in range(categories)]
+    with Session(engine) as session:
+        session.execute(
+            insert(Category),
+            [
+                {
+                    "id": category_id,
+                    "name": category_id,
+                    "created_at": today,
+                    "username": USERNAME,
+                }
+                for category_id in category_ids
+            ],
+        )
+        session.execute(
+            insert(Todo),
+            [
+                {
+                    "id": f"t{index}",
+                    "username": USERNAME,
+                    "content": f"Todo number {index}",
+                    "completed": rng.random() < 0.3,
+                    "created_at": today - timedelta(days=rng.randrange(365)),
+                    "category_id": rng.choice(category_ids),
+                }
+                for index in range(todos)
+            ],
+        )
+        session.commit()
+
+
+def _stdlib_response(content) -> bytes:
+    # What starlette's JSONResponse renders.
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode()
+
+
+def _todos(session: Session):
+    return session.exec(
+        select(Todo).where(Todo.username == USERNAME).order_by(Todo.created_at)
+    ).all()
+
+
+def _categories(session: Session) -> List[CategoryWithTodos]:
+    categories = session.exec(
+        select(Category)
+        .where(Category.username == USERNAME)
+        .options(selectinload(Category.todos))
+    ).all()
+    return [
+        CategoryWithTodos(**category.model_dump(), todos=category.todos)
+        for category in categories
+    ]
+
+
+def todos_paths(session: Session, fields: str) -> Dict[str, Callable[[], bytes]]:
+    def fastapi():
+        todos = _todo_list.validate_python(_todos(session), from_attributes=True)
+        return _stdlib_response(_todo_list.dump_python(todos, mode="json"))
+
+    def orm():
+        return _todo_list.dump_json(_todos(session))
+
+    def projected_rows(columns, names):
+        return rows_json(
+            session.execute(
+                select(*columns)
+                .where(Todo.username == USERNAME)
+                .order_by(Todo.created_at)
+            ),
+            names,
+        )
+
+    def rows():
+        return projected_rows(_TODO_COLUMNS, _TODO_FIELDS)
+
+    def rows_fields():
+        return projected_rows(*project(Todo, fields))
+
+    return {"fastapi": fastapi, "orm": orm, "rows": rows, "rows-fields": rows_fields}
+
+
+def categories_paths(session: Session, fields: str) -> Dict[str, Callable[[], bytes]]:
+    def fastapi():
+        result = _category_with_todos_list.validate_python(
+            _categories(session), from_attributes=True
+        )
+        return _stdlib_response(
+            _category_with_todos_list.dump_python(result, mode="json")
+        )
+
+    def orm():
+        return _category_with_todos_list.dump_json(_categories(session))
+
+    def rows():
+        return categories_with_todos_json(session, USERNAME)
+
+    def rows_fields():
+        projection = project(Todo, fields, required=("category_id",))
+        return categories_with_todos_json(session, USERNAME, projection)
+
+    return {"fastapi": fastapi, "orm": orm, "rows": rows, "rows-fields": rows_fields}
+
+
+def measure(session: Session, build: Callable[[], bytes], repeat: int) -> dict:
+    """Time ``build`` in a fresh identity map and measure its peak memory."""
+    timings = []
+    for _ in range(repeat):
+        session.expunge_all()
+        started = time.perf_counter()
+        build()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    session.expunge_all()
+    tracemalloc.start()
+    try:
+        size = len(build())
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"ms": statistics.median(timings), "size": size, "peak": peak}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--todos", type=int, default=10000)
+    parser.add_argument("--categories", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--fields", default="id,content,completed")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_db_engine(f"sqlite:///{Path(tmp) / 'serialization.db'}")
+        migrate(engine)
+        seed(engine, args.todos, args.categories)
+
+        print(
+            f"{'payload':<24}{'path':<14}{'ms':>10}{'KiB':>10}"
+            f"{'peak KiB':>10}{'vs fastapi':>12}"
+        )
+        with Session(engine) as session:
+            for payload, paths in (
+                ("todos", todos_paths(session, args.fields)),
+                ("categories_with_todos", categories_paths(session, args.fields)),
+            ):
+                results = {
+                    name: measure(session, build, args.repeat)
+                    for name, build in paths.items()
+                }
+                orjson = serialization.orjson
+                serialization.orjson = None
+                try:
+                    results["rows-stdlib"] = measure(
+                        session, paths["rows"], args.repeat
+                    )
+                finally:
+                    serialization.orjson = orjson
+                for name, result in results.items():
+                    print(
+                        f"{payload:<24}{name:<14}{result['ms']:>10.1f}"
+                        f"{result['size'] / 1024:>10.0f}"
+                        f"{result['peak'] / 1024:>10.0f}"
+                        f"{results['fastapi']['ms'] / result['ms']:>11.1f}x"
+                    )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Startup (import time) benchmark.
+
+Imports ``app.main`` in fresh interpreters under ``python -X importtime``
+and reports the median cumulative import time, plus the modules with the
+highest self time. It exits with status 1 when the median exceeds
+``--budget-ms`` or when a module that must only load on first use (the
+password hashing and JWT backends) is imported at startup. Run it in CI to
+catch cold start regressions.
+
+The budget depends on the machine; ``-X importtime`` itself adds some
+overhead, so compare numbers taken the same way on the same machine.
+
+Usage:
+    python -m benchmarks.startup --runs 5 --budget-ms 1500
+"""
+
+# Standard library imports
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+MODULE = "app.main"
+
+# Imported on first use by app.core.security, never at startup.
+LAZY_MODULES = ("passlib", "jose", "bcrypt", "cryptography")
+
+
+def measure_import(database_url: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Import ``MODULE`` in a new interpreter.
+
+    Returns:
+        dict: Self and cumulative import time (microseconds) per module
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=ROOT,
+        env={**os.environ, "DATABASE_URL": database_url},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # the header line
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def check(runs: List[Dict[str, Tuple[int, int]]], budget_ms: float) -> List[str]:
+    """Return the budget and laziness violations found in ``runs``."""
+    failures = []
+    median_ms = statistics.median(run[MODULE][1] for run in runs) / 1000
+    if median_ms > budget_ms:
+        failures.append(
+            f"importing {MODULE} took {median_ms:.0f} ms (budget {budget_ms:.0f} ms)"
+        )
+    eager = sorted(
+        {name.split(".")[0] for run in runs for name in run} & set(LAZY_MODULES)
+    )
+    if eager:
+        failures.append(f"imported at startup: {', '.join(eager)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules shown")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{Path(tmp) / 'startup.db'}"
+        runs = [measure_import(database_url) for _ in range(args.runs)]
+
+    totals = sorted(run[MODULE][1] / 1000 for run in runs)
+    print(
+        f"import {MODULE}: median {statistics.median(totals):.0f} ms "
+        f"(min {totals[0]:.0f}, max {totals[-1]:.0f}) over {args.runs} runs"
+    )
+    print(f"\n{'module':<48}{'self ms':>10}")
+    slowest = sorted(runs[0].items(), key=lambda item: item[1][0], reverse=True)
+    for name, (self_us, _) in slowest[: args.top]:
+        print(f"{name:<48}{self_us / 1000:>10.1f}")
+
+    failures = check(runs, args.budget_ms)
+    for failure in failures:
+        print(f"\nFAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
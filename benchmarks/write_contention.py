@@ -0,0 +1,121 @@
+"""
+SQLite write-contention benchmark.
+
+Runs concurrent writer threads (one insert + commit per transaction) next to
+reader threads (per-user listing queries) against a fresh database file, once
+with a bare ``create_engine`` and once with the tuned ``create_db_engine``
+(WAL, ``synchronous=NORMAL``, busy timeout, cache and mmap pragmas). Reports
+throughput, latency percentiles and "database is locked" errors for each.
+
+Usage:
+    python -m benchmarks.write_contention --writers 8 --readers 8 --seconds 5
+"""
+
+# Standard library imports
+import argparse
+import tempfile
+import threading
+import time
+from datetime import date
+from pathlib import Path
+
+# Third-party imports
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, create_engine, select
+
+# Local imports
+from app.db.database import create_db_engine
+from app.db.migrations import migrate
+from app.models import Todo
+from benchmarks.concurrency import percentile
+
+
+def _worker(engine, kind: str, index: int, deadline: float, stats: dict, lock):
+    latencies = []
+    errors = 0
+    username = f"user{index % 4}"
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            with Session(engine) as session:
+                if kind == "write":
+                    session.add(
+                        Todo(
+                            username=username,
+                            content=f"Todo from {index}",
+                            created_at=date.today(),
+                        )
+                    )
+                    session.commit()
+                else:
+                    session.exec(
+                        select(Todo).where(Todo.username == username).limit(50)
+                    ).all()
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - started)
+
+    with lock:
+        stats[kind]["latencies"].extend(latencies)
+        stats[kind]["errors"] += errors
+
+
+def run(engine, writers: int, readers: int, seconds: float) -> dict:
+    """Run the contention workload on ``engine`` and summarize it."""
+    migrate(engine)
+    stats = {kind: {"latencies": [], "errors": 0} for kind in ("write", "read")}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(
+            target=_worker, args=(engine, kind, index, deadline, stats, lock)
+        )
+        for kind, count in (("write", writers), ("read", readers))
+        for index in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    summary = {}
+    for kind, values in stats.items():
+        latencies = values["latencies"] or [0.0]
+        summary[kind] = {
+            "ops_per_sec": len(values["latencies"]) / seconds,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "locked_errors": values["errors"],
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        profiles = {
+            "default": create_engine(
+                f"sqlite:///{Path(tmp) / 'default.db'}",
+                connect_args={"check_same_thread": False},
+            ),
+            "tuned": create_db_engine(f"sqlite:///{Path(tmp) / 'tuned.db'}"),
+        }
+        for name, engine in profiles.items():
+            summary = run(engine, args.writers, args.readers, args.seconds)
+            for kind, values in summary.items():
+                print(
+                    f"{name:>8} {kind:>5}: {values['ops_per_sec']:8,.0f} ops/s  "
+                    f"p50 {values['p50_ms']:7.2f} ms  p99 {values['p99_ms']:8.2f} ms  "
+                    f"locked errors {values['locked_errors']}"
+                )
+
+
+if __name__ == "__main__":
+    main()
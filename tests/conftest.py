@@ -1,14 +1,28 @@
 import pytest
 from fastapi.testclient import TestClient
-from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel import Session, create_engine
 from sqlmodel.pool import StaticPool
 from typing import Generator
 
 from app.main import app
-from app.db.database import get_db
+from app.db.database import get_db, get_replica_db
+from app.db.migrations import migrate
 from app.core.security import create_access_token
+from app.core.response_cache import response_cache
+from app.core.revocation import revocation_list
+from app.core.token_cache import token_cache
 from app.models import User
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    token_cache.clear()
+    response_cache.clear()
+    revocation_list.clear()
+    yield
+    token_cache.clear()
+    response_cache.clear()
+    revocation_list.clear()
+
 @pytest.fixture(name="session")
 def session_fixture():
     engine = create_engine(
@@ -16,7 +30,7 @@ def session_fixture():
         connect_args={"check_same_thread": False},
         poolclass=StaticPool,
     )
-    SQLModel.metadata.create_all(engine)
+    migrate(engine)
     with Session(engine) as session:
         yield session
 
@@ -26,6 +40,7 @@ def client_fixture(session: Session):
         return session
 
     app.dependency_overrides[get_db] = get_session_override
+    app.dependency_overrides[get_replica_db] = get_session_override
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -1,5 +1,6 @@
 import pytest
 from datetime import date
+from sqlalchemy import event
 from app.models import Category, Todo
 
 
@@ -111,3 +112,92 @@ async def test_delete_category(client, test_token, session):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 0
+
+
+@pytest.mark.asyncio
+async def test_categories_with_todos_query_count(client, test_token, session):
+    for index in range(10):
+        category = Category(
+            name=f"Category {index}",
+            created_at=date.today(),
+            username="testuser"
+        )
+        session.add(category)
+        session.add(Todo(
+            username="testuser",
+            content=f"Todo {index}",
+            completed=False,
+            created_at=date.today(),
+            category_id=category.id
+        ))
+    session.commit()
+
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        headers = {"Authorization": f"Bearer {test_token}"}
+        response = client.get("/categories_with_todos", headers=headers)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data) == 10
+    assert all(len(category["todos"]) == 1 for category in data)
+
+    todo_queries = [s for s in statements if "FROM todo" in s]
+    category_queries = [s for s in statements if "FROM category" in s]
+    assert len(todo_queries) == 1
+    assert len(category_queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_categories_paginated(client, test_token, session):
+    for index in range(3):
+        session.add(Category(
+            name=f"Category {index}",
+            created_at=date(2024, 1, index + 1),
+            username="testuser"
+        ))
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get("/categories", headers=headers, params={"limit": 2})
+    assert response.status_code == 200
+    assert [c["name"] for c in response.json()] == ["Category 0", "Category 1"]
+
+    cursor = response.headers["X-Next-Cursor"]
+    response = client.get(
+        "/categories", headers=headers, params={"limit": 2, "cursor": cursor})
+    assert [c["name"] for c in response.json()] == ["Category 2"]
+    assert "X-Next-Cursor" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_categories_with_todos_field_projection(client, test_token, session):
+    category = Category(name="Work", created_at=date.today(), username="testuser")
+    session.add(category)
+    session.add(
+        Todo(
+            username="testuser",
+            content="Report",
+            created_at=date.today(),
+            category_id=category.id,
+        )
+    )
+    session.commit()
+
+    response = client.get(
+        "/categories_with_todos",
+        headers={"Authorization": f"Bearer {test_token}"},
+        params={"fields": "id,content"},
+    )
+    assert response.status_code == 200
+    [result] = response.json()
+    assert result["name"] == "Work"
+    assert [set(todo) for todo in result["todos"]] == [{"id", "content"}]
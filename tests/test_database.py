@@ -0,0 +1,103 @@
+import os
+from datetime import date
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import Session
+
+from app.core.config import DB_POOL_SIZE
+from app.core.response_cache import response_cache
+from app.core.security import create_access_token
+from app.db import database
+from app.db.database import create_db_engine, get_db, get_replica_db
+from app.db.migrations import migrate
+from app.main import app
+from app.models import User
+
+
+def test_sqlite_engine_applies_pragmas(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'tuned.db'}")
+    with engine.connect() as connection:
+        pragma = lambda name: connection.execute(text(f"PRAGMA {name}")).scalar()
+        assert pragma("journal_mode") == "wal"
+        assert pragma("synchronous") == 1  # NORMAL
+        assert pragma("busy_timeout") == 5000
+        assert pragma("cache_size") < 0
+    assert engine.pool.size() == DB_POOL_SIZE
+    engine.dispose()
+
+
+def test_in_memory_engine_skips_pool_options():
+    engine = create_db_engine("sqlite://")
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+    engine.dispose()
+
+
+def test_reads_route_to_replica_except_after_own_write(tmp_path, monkeypatch):
+    primary = create_db_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_db_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine in (primary, replica):
+        migrate(engine)
+        with Session(engine) as session:
+            session.add(User(
+                username="testuser",
+                name="Test User",
+                hashed_password="x",
+                disabled=False
+            ))
+            session.commit()
+
+    def session_for(engine):
+        def override():
+            with Session(engine) as session:
+                yield session
+        return override
+
+    app.dependency_overrides[get_db] = session_for(primary)
+    app.dependency_overrides[get_replica_db] = session_for(replica)
+    try:
+        client = TestClient(app)
+        headers = {
+            "Authorization": f"Bearer {create_access_token({'sub': 'testuser'})}"
+        }
+        response = client.post("/todos", headers=headers, json={
+            "content": "Written to the primary",
+            "created_at": str(date.today()),
+        })
+        assert response.status_code == 201
+
+        # Read-your-writes: right after the write, reads go to the primary.
+        response = client.get("/todos", headers=headers)
+        assert [todo["content"] for todo in response.json()] == [
+            "Written to the primary"]
+
+        # Outside the window reads go to the (unreplicated) replica.
+        monkeypatch.setattr("app.db.database.READ_YOUR_WRITES_SECONDS", 0)
+        response_cache.clear()
+        response = client.get("/todos", headers=headers)
+        assert response.json() == []
+    finally:
+        app.dependency_overrides.clear()
+        primary.dispose()
+        replica.dispose()
+
+
+def test_forked_workers_do_not_reuse_parent_connections(tmp_path, monkeypatch):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'forked.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(database, "read_engine", engine)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert engine.pool.checkedin() == 1
+
+    pid = os.fork()
+    if pid == 0:
+        # The at-fork hook has already run in the child.
+        os._exit(0 if engine.pool.checkedin() == 0 else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+    # The parent keeps its connection.
+    assert engine.pool.checkedin() == 1
+    engine.dispose()
@@ -0,0 +1,40 @@
+import asyncio
+import pytest
+from datetime import date
+
+from app.core.events import LocalBroker, event_broker
+from app.routers.events import format_event
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_a_single_resync():
+    broker = LocalBroker(max_queue=2)
+    subscription = broker.subscribe("testuser")
+    for _ in range(5):
+        broker.publish("testuser", {"type": "change", "entities": ["todo"]})
+    broker.publish("otheruser", {"type": "change", "entities": ["todo"]})
+    await asyncio.sleep(0)
+
+    assert await subscription.get() == {"type": "resync"}
+    assert subscription.queue.empty()
+
+    broker.unsubscribe(subscription)
+    assert broker.subscriber_count == 0
+
+@pytest.mark.asyncio
+async def test_committed_writes_are_published(client, test_token):
+    subscription = event_broker.subscribe("testuser")
+    try:
+        headers = {"Authorization": f"Bearer {test_token}"}
+        response = client.post("/todos", headers=headers, json={
+            "content": "Notify me",
+            "created_at": str(date.today())
+        })
+        assert response.status_code == 201
+
+        event = await asyncio.wait_for(subscription.get(), 1)
+        assert event == {"type": "change", "entities": ["todo"]}
+        assert format_event(event) == (
+            b'event: change\ndata: {"entities": ["todo"]}\n\n')
+    finally:
+        event_broker.unsubscribe(subscription)
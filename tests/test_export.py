@@ -0,0 +1,57 @@
+import gzip
+import json
+
+import pytest
+from datetime import date
+from app.models import Category, Todo
+
+
+@pytest.fixture(name="export_data")
+def export_data_fixture(session):
+    category = Category(
+        name="Home",
+        created_at=date.today(),
+        username="testuser"
+    )
+    session.add(category)
+    for index in range(3):
+        session.add(Todo(
+            username="testuser",
+            content=f"Todo {index}",
+            completed=False,
+            created_at=date.today(),
+            category_id=category.id
+        ))
+    session.add(Todo(
+        username="someoneelse",
+        content="Not mine",
+        completed=False,
+        created_at=date.today()
+    ))
+    session.commit()
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson(client, test_token, export_data):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get("/export", headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["type"] for row in rows] == ["category", "todo", "todo", "todo"]
+    assert rows[0]["name"] == "Home"
+    assert rows[1]["created_at"] == str(date.today())
+    assert all(row["username"] == "testuser" for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_export_gzip(client, test_token, export_data):
+    headers = {"Authorization": f"Bearer {test_token}", "Accept-Encoding": "identity"}
+    with client.stream("GET", "/export", headers=headers,
+                       params={"gzip": True}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        raw = b"".join(response.iter_raw())
+
+    lines = gzip.decompress(raw).decode().splitlines()
+    assert len(lines) == 4
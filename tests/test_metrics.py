@@ -0,0 +1,92 @@
+import logging
+
+import pytest
+from sqlalchemy import event
+
+from app.core import sql_trace
+from app.core.metrics import Histogram
+from app.core.request_metrics import (
+    db_queries_per_request,
+    http_request_duration_seconds,
+    http_requests_total,
+)
+
+
+def histogram_sum(histogram, labels):
+    return dict(
+        (sample_labels, value)
+        for name, sample_labels, value in histogram.samples()
+        if name.endswith("_sum")
+    ).get(labels, 0.0)
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_latency_seconds", "Test", ("route",), buckets=(0.1, 1))
+    histogram.observe(0.05, route="/a")
+    histogram.observe(0.5, route="/a")
+    histogram.observe(5, route="/a")
+
+    samples = {(name, labels): value for name, labels, value in histogram.samples()}
+    assert samples[("test_latency_seconds_bucket", '{route="/a",le="0.1"}')] == 1
+    assert samples[("test_latency_seconds_bucket", '{route="/a",le="1"}')] == 2
+    assert samples[("test_latency_seconds_bucket", '{route="/a",le="+Inf"}')] == 3
+    assert samples[("test_latency_seconds_sum", '{route="/a"}')] == 5.55
+    assert histogram.value(route="/a") == 3
+
+@pytest.mark.asyncio
+async def test_requests_are_recorded_per_route_template(client, test_token):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    route = "/todos/{todo_id}"
+    requests = http_requests_total.value(method="PUT", route=route, status="404")
+    queries = histogram_sum(db_queries_per_request, '{route="/todos/{todo_id}"}')
+
+    response = client.put("/todos/missing", headers=headers, json={"content": "x"})
+    assert response.status_code == 404
+
+    assert http_requests_total.value(method="PUT", route=route, status="404") == requests + 1
+    assert http_request_duration_seconds.value(method="PUT", route=route) >= 1
+    # The user lookup and the todo lookup ran in a worker thread.
+    assert histogram_sum(
+        db_queries_per_request, '{route="/todos/{todo_id}"}') == queries + 2
+
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_bucket{method="PUT",route="/todos/{todo_id}",le="+Inf"}' in body
+    assert "db_sessions_active" in body
+
+
+@pytest.mark.asyncio
+async def test_sql_trace_adds_debug_headers(client, test_token, monkeypatch):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    assert "X-DB-Query-Count" not in client.get("/todos", headers=headers).headers
+
+    monkeypatch.setattr("app.core.request_metrics.SQL_TRACE", True)
+    response = client.get("/todos", headers=headers)
+    assert response.status_code == 200
+    assert int(response.headers["X-DB-Query-Count"]) > 0
+    assert float(response.headers["X-DB-Time-Ms"]) > 0
+
+
+@pytest.mark.asyncio
+async def test_sql_trace_logs_slow_queries_with_plan(
+    client, session, test_token, monkeypatch, caplog
+):
+    monkeypatch.setattr(sql_trace, "SLOW_QUERY_MS", 0)
+    engine = session.get_bind()
+    sql_trace.install_sql_tracing(engine)
+    try:
+        with caplog.at_level(logging.DEBUG, logger="app.sql"):
+            response = client.get(
+                "/todos", headers={"Authorization": f"Bearer {test_token}"}
+            )
+    finally:
+        event.remove(engine, "after_cursor_execute", sql_trace._trace)
+
+    assert response.status_code == 200
+    slow = [
+        record.getMessage()
+        for record in caplog.records
+        if record.levelno == logging.WARNING and "FROM todo" in record.getMessage()
+    ]
+    assert slow
+    assert slow[0].startswith("Slow query on GET /todos")
+    assert "ix_todo_username_created_at_id" in slow[0]
@@ -0,0 +1,65 @@
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import create_engine
+
+from app.db.migrations import MIGRATIONS, migrate
+
+
+def test_migrate_adds_indexes_to_existing_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE "user" (id VARCHAR PRIMARY KEY, username VARCHAR, '
+            'name VARCHAR, hashed_password VARCHAR, disabled BOOLEAN)'))
+        connection.execute(text(
+            "CREATE TABLE category (id VARCHAR PRIMARY KEY, name VARCHAR, "
+            "created_at DATE, username VARCHAR)"))
+        connection.execute(text(
+            "CREATE TABLE todo (id VARCHAR PRIMARY KEY, username VARCHAR, "
+            "content VARCHAR, completed BOOLEAN, created_at DATE, "
+            "category_id VARCHAR REFERENCES category (id))"))
+        connection.execute(text(
+            "INSERT INTO todo VALUES ('1', 'u', 'Legacy', 0, '2024-01-01', NULL)"))
+
+    latest = MIGRATIONS[-1].version
+    assert migrate(engine) == latest
+    # Running again is a no-op.
+    assert migrate(engine) == latest
+
+    inspector = inspect(engine)
+    todo_indexes = {index["name"] for index in inspector.get_indexes("todo")}
+    assert {"ix_todo_username_category_id", "ix_todo_category_id"} <= todo_indexes
+    assert "ix_todo_username_updated_at" in todo_indexes
+    user_indexes = {
+        index["name"]: index for index in inspector.get_indexes("user")
+    }
+    assert user_indexes["ix_user_username"]["unique"]
+
+    with engine.connect() as connection:
+        versions = connection.execute(
+            text("SELECT version FROM schema_version")).scalars().all()
+        legacy_updated_at = connection.execute(
+            text("SELECT updated_at FROM todo")).scalar_one()
+    assert versions == [migration.version for migration in MIGRATIONS]
+    assert legacy_updated_at is not None
+    engine.dispose()
+
+
+def test_failing_migration_is_not_skipped(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'duplicates.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(
+            'CREATE TABLE "user" (id VARCHAR PRIMARY KEY, username VARCHAR, '
+            'name VARCHAR, hashed_password VARCHAR, disabled BOOLEAN)'))
+        connection.execute(text(
+            """INSERT INTO "user" VALUES ('1', 'dup', 'A', 'x', 0), ('2', 'dup', 'B', 'x', 0)"""))
+
+    # The unique username index can't be built over duplicate usernames.
+    with pytest.raises(IntegrityError):
+        migrate(engine)
+
+    with engine.connect() as connection:
+        versions = connection.execute(
+            text("SELECT version FROM schema_version")).scalars().all()
+    assert versions == []
@@ -0,0 +1,115 @@
+import pytest
+from datetime import date, timedelta
+
+from sqlalchemy import event
+from sqlmodel import select
+
+from app.core.stats import backfill_counters, compute_stats, read_stats
+from app.db.counters import increment
+from app.models import CategoryTodoCount, Todo
+
+
+@pytest.mark.asyncio
+async def test_stats_counters_match_group_by(client, test_token):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    category = client.post("/categories", headers=headers, json={
+        "name": "Work",
+        "created_at": str(today)
+    }).json()
+
+    client.post("/todos/bulk", headers=headers, json=[
+        {"content": "One", "created_at": str(yesterday)},
+        {"content": "Two", "created_at": str(today), "category_id": category["id"]},
+        {"content": "Three", "created_at": str(today), "category_id": category["id"]},
+    ])
+    todos = {todo["content"]: todo for todo in client.get("/todos", headers=headers).json()}
+    client.put(f"/todos/{todos['One']['id']}", headers=headers, json={"completed": True})
+    client.patch("/todos/bulk", headers=headers, json=[
+        {"id": todos["Two"]["id"], "completed": True},
+        {"id": todos["Two"]["id"], "category_id": "elsewhere"},
+    ])
+    client.delete("/todos", headers=headers, params={"ids": todos["Three"]["id"]})
+
+    counters = client.get("/stats", headers=headers).json()
+    computed = client.get("/stats", headers=headers, params={"source": "query"}).json()
+    assert counters == computed
+    assert counters["total"] == 2
+    assert counters["completed"] == 2
+    assert counters["categories"] == [
+        {"category_id": None, "total": 1, "completed": 1},
+        {"category_id": "elsewhere", "total": 1, "completed": 1},
+    ]
+    assert counters["days"] == [
+        {"day": str(yesterday), "total": 1, "completed": 1},
+        {"day": str(today), "total": 1, "completed": 1},
+    ]
+
+@pytest.mark.asyncio
+async def test_backfill_rebuilds_counters(client, test_token, session):
+    for username, completed in [("testuser", True), ("testuser", False), ("otheruser", True)]:
+        session.add(Todo(
+            username=username,
+            content="Written without the API",
+            completed=completed,
+            created_at=date.today()
+        ))
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    assert client.get("/stats", headers=headers).json()["total"] == 0
+
+    backfill_counters(session.connection())
+    session.commit()
+    counters = client.get("/stats", headers=headers).json()
+    computed = client.get("/stats", headers=headers, params={"source": "query"}).json()
+    assert counters == computed
+    assert (counters["total"], counters["completed"]) == (2, 1)
+
+@pytest.mark.asyncio
+async def test_increment_upserts_all_rows_in_one_statement(session):
+    session.add(CategoryTodoCount(username="a", category_id="x", total=1, completed=1))
+    session.commit()
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        increment(session, CategoryTodoCount, ("username", "category_id"), [
+            {"username": "a", "category_id": "x", "total": 2, "completed": 0},
+            {"username": "a", "category_id": "y", "total": 1, "completed": 1},
+        ])
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+    session.commit()
+
+    assert len(statements) == 1
+    rows = session.exec(select(CategoryTodoCount).order_by(CategoryTodoCount.category_id)).all()
+    assert [(row.category_id, row.total, row.completed) for row in rows] == [
+        ("x", 3, 1),
+        ("y", 1, 1),
+    ]
+
+@pytest.mark.asyncio
+async def test_deleting_a_category_moves_its_todos_to_no_category(client, test_token, session):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    category = client.post("/categories", headers=headers, json={
+        "name": "Work",
+        "created_at": str(date.today())
+    }).json()
+    client.post("/todos/bulk", headers=headers, json=[
+        {"content": "One", "created_at": str(date.today()), "category_id": category["id"]},
+        {"content": "Two", "created_at": str(date.today()), "completed": True},
+    ])
+
+    assert client.delete(f"/categories/{category['id']}", headers=headers).status_code == 200
+
+    counters = read_stats(session, "testuser")
+    assert counters == compute_stats(session, "testuser")
+    assert [(c.category_id, c.total, c.completed) for c in counters.categories] == [
+        (None, 2, 1)
+    ]
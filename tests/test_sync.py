@@ -0,0 +1,76 @@
+import pytest
+from datetime import date, datetime, timedelta, timezone
+
+from app.models import Todo
+from app.routers.sync import decode_sync_cursor, encode_sync_cursor
+
+
+@pytest.mark.asyncio
+async def test_sync_returns_only_changes_since_cursor(client, test_token, session, monkeypatch):
+    monkeypatch.setattr("app.routers.sync.SYNC_OVERLAP_SECONDS", 0)
+    untouched = Todo(
+        username="testuser",
+        content="Untouched",
+        completed=False,
+        created_at=date.today()
+    )
+    edited = Todo(
+        username="testuser",
+        content="Edited",
+        completed=False,
+        created_at=date.today()
+    )
+    removed = Todo(
+        username="testuser",
+        content="Removed",
+        completed=False,
+        created_at=date.today()
+    )
+    session.add_all([untouched, edited, removed])
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get("/sync", headers=headers)
+    assert response.status_code == 200
+    full = response.json()
+    assert len(full["todos"]) == 3
+    assert full["deleted"] == []
+
+    client.patch("/todos/bulk", headers=headers, json=[
+        {"id": edited.id, "completed": True}
+    ])
+    client.delete("/todos", headers=headers, params={"ids": removed.id})
+    client.post("/categories", headers=headers, json={
+        "name": "Work",
+        "created_at": str(date.today())
+    })
+
+    response = client.get("/sync", headers=headers, params={"since": full["cursor"]})
+    assert response.status_code == 200
+    delta = response.json()
+    assert [todo["id"] for todo in delta["todos"]] == [edited.id]
+    assert delta["todos"][0]["completed"] is True
+    assert [category["name"] for category in delta["categories"]] == ["Work"]
+    assert [(item["entity"], item["id"]) for item in delta["deleted"]] == [
+        ("todo", removed.id)]
+
+    response = client.get("/sync", headers=headers, params={"since": delta["cursor"]})
+    assert response.json()["todos"] == []
+    assert response.json()["deleted"] == []
+
+    response = client.get("/sync", headers=headers, params={"since": "!!"})
+    assert response.status_code == 400
+
+
+def test_decode_sync_cursor_normalises_aware_timestamps():
+    aware = datetime(2024, 1, 1, 12, 0, tzinfo=timezone(timedelta(hours=2)))
+    cursor = encode_sync_cursor(aware)
+    assert decode_sync_cursor(cursor) == datetime(2024, 1, 1, 10, 0)
+
+
+@pytest.mark.asyncio
+async def test_sync_accepts_timezone_aware_cursor(client, test_token):
+    cursor = encode_sync_cursor(datetime.now(timezone.utc))
+    response = client.get("/sync", headers={"Authorization": f"Bearer {test_token}"},
+                          params={"since": cursor})
+    assert response.status_code == 200
@@ -2,6 +2,10 @@ import pytest
 import json
 from httpx import AsyncClient
 from datetime import date
+from typing import List
+from pydantic import TypeAdapter
+from sqlmodel import select
+from app.core import serialization
 from app.models import Todo, Category
 
 @pytest.mark.asyncio
@@ -101,3 +105,412 @@ async def test_delete_todos(client, test_token, session):
     assert response.status_code == 200
     data = response.json()
     assert len(data) == 0
+
+@pytest.mark.asyncio
+async def test_list_todos_keyset_pagination(client, test_token, session):
+    for index in range(5):
+        session.add(Todo(
+            username="testuser",
+            content=f"Todo {index}",
+            completed=False,
+            created_at=date(2024, 1, index + 1)
+        ))
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    contents = []
+    params = {"limit": 2}
+    pages = 0
+    while True:
+        response = client.get("/todos", headers=headers, params=params)
+        assert response.status_code == 200
+        contents.extend(todo["content"] for todo in response.json())
+        pages += 1
+        next_cursor = response.headers.get("X-Next-Cursor")
+        if not next_cursor:
+            break
+        params = {"limit": 2, "cursor": next_cursor}
+
+    assert pages == 3
+    assert contents == [f"Todo {index}" for index in range(5)]
+
+@pytest.mark.asyncio
+async def test_list_todos_filters(client, test_token, session):
+    category = Category(
+        name="Work",
+        created_at=date.today(),
+        username="testuser"
+    )
+    session.add(category)
+    session.add(Todo(
+        username="testuser",
+        content="Old done",
+        completed=True,
+        created_at=date(2024, 1, 1)
+    ))
+    session.add(Todo(
+        username="testuser",
+        content="New work",
+        completed=False,
+        created_at=date(2024, 6, 1),
+        category_id=category.id
+    ))
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+
+    response = client.get("/todos", headers=headers, params={"completed": True})
+    assert [todo["content"] for todo in response.json()] == ["Old done"]
+
+    response = client.get(
+        "/todos", headers=headers, params={"category_id": category.id})
+    assert [todo["content"] for todo in response.json()] == ["New work"]
+
+    response = client.get(
+        "/todos", headers=headers,
+        params={"created_from": "2024-02-01", "created_to": "2024-12-31"})
+    assert [todo["content"] for todo in response.json()] == ["New work"]
+
+@pytest.mark.asyncio
+async def test_list_todos_invalid_cursor(client, test_token):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get("/todos", headers=headers, params={"cursor": "garbage"})
+    assert response.status_code == 400
+
+@pytest.mark.asyncio
+async def test_bulk_create_todos(client, test_token, session):
+    existing = Todo(
+        username="testuser",
+        content="Existing",
+        completed=False,
+        created_at=date.today()
+    )
+    session.add(existing)
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    payload = [
+        {"content": "Bulk 1", "created_at": str(date.today())},
+        {"content": "Bulk 2", "created_at": str(date.today()), "completed": True},
+        {"id": existing.id, "content": "Duplicate", "created_at": str(date.today())},
+    ]
+
+    response = client.post("/todos/bulk", headers=headers, json=payload)
+    assert response.status_code == 200
+    results = response.json()
+    assert [result["status"] for result in results] == [201, 201, 409]
+
+    response = client.get("/todos", headers=headers)
+    contents = {todo["content"] for todo in response.json()}
+    assert contents == {"Existing", "Bulk 1", "Bulk 2"}
+
+@pytest.mark.asyncio
+async def test_bulk_update_todos(client, test_token, session):
+    mine = Todo(
+        username="testuser",
+        content="Mine",
+        completed=False,
+        created_at=date.today()
+    )
+    theirs = Todo(
+        username="otheruser",
+        content="Theirs",
+        completed=False,
+        created_at=date.today()
+    )
+    session.add(mine)
+    session.add(theirs)
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    payload = [
+        {"id": mine.id, "content": "Mine updated", "completed": True},
+        {"id": theirs.id, "completed": True},
+        {"id": "missing", "completed": True},
+    ]
+
+    response = client.patch("/todos/bulk", headers=headers, json=payload)
+    assert response.status_code == 200
+    assert [result["status"] for result in response.json()] == [200, 403, 404]
+
+    session.expire_all()
+    assert session.get(Todo, mine.id).content == "Mine updated"
+    assert session.get(Todo, mine.id).completed is True
+    assert session.get(Todo, theirs.id).completed is False
+
+@pytest.mark.asyncio
+async def test_bulk_rejects_empty_list(client, test_token):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.post("/todos/bulk", headers=headers, json=[])
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_delete_completed_todos(client, test_token, session):
+    session.add(Todo(
+        username="testuser",
+        content="Done",
+        completed=True,
+        created_at=date.today()
+    ))
+    session.add(Todo(
+        username="testuser",
+        content="Pending",
+        completed=False,
+        created_at=date.today()
+    ))
+    session.add(Todo(
+        username="otheruser",
+        content="Someone else's",
+        completed=True,
+        created_at=date.today()
+    ))
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.delete("/todos", headers=headers, params={"completed": True})
+    assert response.status_code == 200
+    assert [todo["content"] for todo in response.json()] == ["Done"]
+
+    response = client.get("/todos", headers=headers)
+    assert [todo["content"] for todo in response.json()] == ["Pending"]
+
+    response = client.delete("/todos", headers=headers)
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_delete_todos_forbidden_is_atomic(client, test_token, session, monkeypatch):
+    monkeypatch.setattr("app.routers.todo.DELETE_CHUNK_SIZE", 1)
+    mine = Todo(
+        username="testuser",
+        content="Mine",
+        completed=False,
+        created_at=date.today()
+    )
+    theirs = Todo(
+        username="otheruser",
+        content="Theirs",
+        completed=False,
+        created_at=date.today()
+    )
+    session.add(mine)
+    session.add(theirs)
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    params = {"ids": f"{mine.id},{theirs.id}"}
+    response = client.delete("/todos", headers=headers, params=params)
+    assert response.status_code == 403
+
+    response = client.get("/todos", headers=headers)
+    assert [todo["content"] for todo in response.json()] == ["Mine"]
+
+@pytest.mark.asyncio
+async def test_get_todos_is_cached_until_a_write(client, test_token, session):
+    from app.core.response_cache import response_cache_hits_total
+
+    session.add(Todo(
+        username="testuser",
+        content="Cached",
+        completed=False,
+        created_at=date.today()
+    ))
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    hits = response_cache_hits_total.value(endpoint="/todos")
+    first = client.get("/todos", headers=headers, params={"limit": 10})
+    second = client.get("/todos", headers=headers, params={"limit": 10})
+    assert second.content == first.content
+    assert response_cache_hits_total.value(endpoint="/todos") == hits + 1
+
+    # A category write leaves cached todo listings alone...
+    response = client.post("/categories", headers=headers, json={
+        "name": "Work",
+        "created_at": str(date.today())
+    })
+    assert response.status_code == 201
+    client.get("/todos", headers=headers, params={"limit": 10})
+    assert response_cache_hits_total.value(endpoint="/todos") == hits + 2
+
+    # ...while a todo write invalidates them.
+    response = client.post("/todos", headers=headers, json={
+        "content": "Fresh",
+        "created_at": str(date.today())
+    })
+    assert response.status_code == 201
+    response = client.get("/todos", headers=headers, params={"limit": 10})
+    assert sorted(todo["content"] for todo in response.json()) == ["Cached", "Fresh"]
+    assert response_cache_hits_total.value(endpoint="/todos") == hits + 2
+
+@pytest.mark.asyncio
+async def test_deleting_a_category_invalidates_cached_todos(client, test_token):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    category = client.post("/categories", headers=headers, json={
+        "name": "Work",
+        "created_at": str(date.today())
+    }).json()
+    client.post("/todos", headers=headers, json={
+        "content": "Filed",
+        "created_at": str(date.today()),
+        "category_id": category["id"]
+    })
+    params = {"category_id": category["id"]}
+    assert len(client.get("/todos", headers=headers, params=params).json()) == 1
+    assert client.get("/todos", headers=headers).json()[0]["category_id"] == category["id"]
+
+    client.delete(f"/categories/{category['id']}", headers=headers)
+    assert client.get("/todos", headers=headers, params=params).json() == []
+    assert client.get("/todos", headers=headers).json()[0]["category_id"] is None
+
+@pytest.mark.asyncio
+async def test_get_todos_conditional_get(client, test_token):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get("/todos", headers=headers)
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+
+    response = client.get("/todos", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # Category writes don't change the todo listing's ETag; todo writes do.
+    client.post("/categories", headers=headers, json={
+        "name": "Work",
+        "created_at": str(date.today())
+    })
+    response = client.get("/todos", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    client.post("/todos", headers=headers, json={
+        "content": "New",
+        "created_at": str(date.today())
+    })
+    response = client.get("/todos", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert [todo["content"] for todo in response.json()] == ["New"]
+
+@pytest.mark.asyncio
+async def test_get_todos_etag_changes_when_a_category_delete_moves_todos(client, test_token):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    empty, work = (
+        client.post("/categories", headers=headers, json={
+            "name": name,
+            "created_at": str(date.today())
+        }).json()
+        for name in ("Empty", "Work")
+    )
+    client.post("/todos", headers=headers, json={
+        "content": "Filed",
+        "created_at": str(date.today()),
+        "category_id": work["id"]
+    })
+    etag = client.get("/todos", headers=headers).headers["ETag"]
+
+    # Deleting a category without todos leaves the todo listing unchanged...
+    client.delete(f"/categories/{empty['id']}", headers=headers)
+    response = client.get("/todos", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 304
+
+    # ...deleting one with todos uncategorizes them.
+    client.delete(f"/categories/{work['id']}", headers=headers)
+    response = client.get("/todos", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["category_id"] is None
+
+@pytest.mark.asyncio
+async def test_search_todos(client, test_token, session):
+    for username, content in [
+        ("testuser", "Buy milk"),
+        ("testuser", "Buy milk and milk powder"),
+        ("testuser", "Walk the dog"),
+        ("otheruser", "Buy milk"),
+    ]:
+        session.add(Todo(
+            username=username,
+            content=content,
+            completed=False,
+            created_at=date.today()
+        ))
+    session.commit()
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    response = client.get("/todos/search", headers=headers, params={"q": "mil"})
+    assert response.status_code == 200
+    results = [todo["content"] for todo in response.json()]
+    assert results == ["Buy milk and milk powder", "Buy milk"]
+
+    response = client.get(
+        "/todos/search", headers=headers, params={"q": "mil", "limit": 1, "offset": 1})
+    assert [todo["content"] for todo in response.json()] == ["Buy milk"]
+
+    # The index follows updates and deletes, and operators are taken literally.
+    walk = client.get(
+        "/todos/search", headers=headers, params={"q": "dog"}).json()[0]
+    client.put(f"/todos/{walk['id']}", headers=headers, json={"content": "Walk the cat"})
+    response = client.get("/todos/search", headers=headers, params={"q": "dog"})
+    assert response.json() == []
+    client.delete("/todos", headers=headers, params={"ids": walk["id"]})
+    response = client.get("/todos/search", headers=headers, params={"q": 'cat" OR "'})
+    assert response.json() == []
+
+    response = client.get("/todos/search", headers=headers, params={"q": "  "})
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.asyncio
+async def test_list_todos_encodes_rows_like_the_model(
+    client, test_token, session, monkeypatch, use_orjson
+):
+    if not use_orjson:
+        monkeypatch.setattr(serialization, "orjson", None)
+    category = Category(name="Work", created_at=date.today(), username="testuser")
+    session.add(category)
+    session.add(Todo(username="testuser", content="Café ✓", created_at=date.today()))
+    session.add(
+        Todo(
+            username="testuser",
+            content="Report",
+            completed=True,
+            created_at=date(2024, 2, 29),
+            category_id=category.id,
+        )
+    )
+    session.commit()
+
+    response = client.get("/todos", headers={"Authorization": f"Bearer {test_token}"})
+    assert response.status_code == 200
+    todos = session.exec(select(Todo).order_by(Todo.created_at, Todo.id)).all()
+    assert response.json() == json.loads(TypeAdapter(List[Todo]).dump_json(todos))
+
+
+@pytest.mark.asyncio
+async def test_list_todos_field_projection(client, test_token, session):
+    for index in range(3):
+        session.add(
+            Todo(username="testuser", content=f"Todo {index}", created_at=date.today())
+        )
+    session.commit()
+    headers = {"Authorization": f"Bearer {test_token}"}
+
+    response = client.get(
+        "/todos", headers=headers, params={"fields": "content,completed", "limit": 2}
+    )
+    assert response.status_code == 200
+    page = response.json()
+    assert len(page) == 2
+    assert all(list(todo) == ["content", "completed"] for todo in page)
+
+    # The cursor still works although created_at and id were not requested.
+    response = client.get(
+        "/todos",
+        headers=headers,
+        params={"fields": "content", "cursor": response.headers["X-Next-Cursor"]},
+    )
+    assert len(response.json()) == 1
+    assert set(response.json()[0]) == {"content"}
+
+    response = client.get("/todos", headers=headers, params={"fields": "id,secret"})
+    assert response.status_code == 400
+    assert "secret" in response.json()["detail"]
@@ -0,0 +1,177 @@
+import asyncio
+import subprocess
+import sys
+import threading
+import time
+from datetime import timedelta
+
+import pytest
+from jose import jwt
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.core import revocation
+from app.core.hashing import HashingPool
+from app.core.revocation import RevocationList, revocation_list
+from app.core.security import create_access_token, is_token_revoked
+from app.core.token_cache import TokenCache, token_cache
+from app.models import RevokedToken, utcnow
+
+
+@pytest.mark.asyncio
+async def test_register_and_login(client):
+    user_data = {
+        "username": "newuser",
+        "name": "New User",
+        "password": "secret123"
+    }
+
+    response = client.post("/register", json=user_data)
+    assert response.status_code == 201
+    assert response.json()["username"] == "newuser"
+
+    response = client.post(
+        "/token", data={"username": "newuser", "password": "secret123"})
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+    response = client.post(
+        "/token", data={"username": "newuser", "password": "wrong"})
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_rejects_when_saturated():
+    pool = HashingPool(workers=1, queue_limit=1, retry_after=3)
+    release = threading.Event()
+    try:
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.05)
+        assert pool.pending == 2
+        assert pool.queue_depth == 1
+
+        with pytest.raises(HTTPException) as exc_info:
+            await pool.run(release.wait)
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "3"
+
+        release.set()
+        await asyncio.gather(running, queued)
+        assert pool.pending == 0
+    finally:
+        release.set()
+        pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_metrics_exposes_hashing_queue_depth(client):
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert "hashing_pool_queue_depth 0" in response.text
+
+
+@pytest.mark.asyncio
+async def test_token_cache_skips_user_lookup(client, test_token, session):
+    statements = []
+
+    def record_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    headers = {"Authorization": f"Bearer {test_token}"}
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        assert client.get("/users/me", headers=headers).status_code == 200
+        assert len(statements) == 1
+        assert client.get("/users/me", headers=headers).status_code == 200
+        assert len(statements) == 1
+
+        token_cache.invalidate_user("testuser")
+        assert client.get("/users/me", headers=headers).status_code == 200
+        assert len(statements) == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+
+@pytest.mark.asyncio
+async def test_token_cache_lru_and_expiry(test_user):
+    cache = TokenCache(max_size=2, ttl=60)
+    cache.put("a", test_user, time.time() + 60)
+    cache.put("b", test_user, time.time() + 60)
+    assert cache.get("a") is test_user
+    cache.put("c", test_user, time.time() + 60)
+    assert cache.get("b") is None
+    assert cache.get("a") is test_user
+
+    cache.put("expired", test_user, time.time() - 1)
+    assert cache.get("expired") is None
+
+    cache.invalidate_token("a")
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_only_that_token(client, test_user):
+    token = create_access_token(data={"sub": test_user.username})
+    other_token = create_access_token(data={"sub": test_user.username})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    assert client.post("/logout", headers=headers).status_code == 200
+    assert is_token_revoked(token)
+    assert client.get("/users/me", headers=headers).status_code == 401
+    assert client.get("/verify-token", headers=headers).json() is False
+
+    other_headers = {"Authorization": f"Bearer {other_token}"}
+    assert client.get("/users/me", headers=other_headers).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_revocations_from_other_workers_apply_to_cached_tokens(
+    client, session, test_token
+):
+    headers = {"Authorization": f"Bearer {test_token}"}
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    # Another worker revokes the token: only its database row is shared.
+    payload = jwt.get_unverified_claims(test_token)
+    session.add(
+        RevokedToken(
+            jti=payload["jti"],
+            expires_at=utcnow() + timedelta(minutes=5),
+        )
+    )
+    session.commit()
+    assert client.get("/users/me", headers=headers).status_code == 200
+
+    revocation_list.sync(session)
+    assert client.get("/users/me", headers=headers).status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_revocation_list_forgets_expired_tokens(monkeypatch):
+    revoked = RevocationList(sync_interval=60)
+    now = time.time()
+    revoked.add("expired", now - 1)
+    revoked.add("short", now + 30)
+    revoked.add("long", now + 3600)
+    assert not revoked.is_revoked("expired")
+    assert revoked.is_revoked("short") and revoked.is_revoked("long")
+
+    monkeypatch.setattr(revocation.time, "time", lambda: now + 300)
+    revoked.add("new", now + 600)
+    assert not revoked.is_revoked("short")
+    assert revoked.is_revoked("long") and revoked.is_revoked("new")
+    assert len(revoked) == 2
+
+
+def test_crypto_backends_load_on_first_use():
+    script = (
+        "import sys, app.main; "
+        "print(sorted({'jose', 'passlib', 'bcrypt'} & set(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"